@@ -4,75 +4,269 @@ Static site generator for BibleAquifer
 Generates index.html and catalog.html from GitHub API data
 """
 
+import argparse
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
+import functools
+from itertools import groupby
+import hashlib
 import json
+import logging
 import os
+import random
 import re
 import requests
+import threading
 from requests.adapters import HTTPAdapter
+from requests.auth import AuthBase
 from urllib3.util.retry import Retry
 import time
-import yaml
-from typing import Dict, List, Any, Optional
-from jinja2 import Template
+from typing import Dict, List, Any, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+from jinja2 import DictLoader, Environment
 
 # Configuration
 GITHUB_API = 'https://api.github.com'
+GITHUB_GRAPHQL_API = f'{GITHUB_API}/graphql'
 ORG_NAME = 'BibleAquifer'
 ORG_REPO_NAME = '.github'
 README_PATH = 'profile/README.md'
-EXCLUDED_REPOS = ['docs', 'ACAI', 'bibleaquifer.github.io', '.github']
+# Branch that resource trees and metadata are read from (the catalog page
+# links to files on the same branch)
+CONTENT_BRANCH = 'main'
+EXCLUDED_REPOS = frozenset(['docs', 'ACAI', 'bibleaquifer.github.io', '.github'])
+# Concurrency for GitHub requests: repositories are processed in parallel, and
+# each repository fans out its per-language requests over a second pool
+REPO_WORKERS = 8
+LANGUAGE_WORKERS = 4
+# Upper limit on requests in flight at once across all workers, to stay clear
+# of GitHub's secondary rate limits on concurrent requests
+MAX_CONCURRENT_REQUESTS = 10
 # get set up to do retries on requests
 # Define retry strategy
 retry_strategy = Retry(
     total=7,                  # total retry attempts
     backoff_factor=1,         # sleep between retries: {backoff factor} * (2 ** retry count)
-    status_forcelist=[429, 500, 502, 503, 504],  # retry on these statuses
-    allowed_methods=["HEAD", "GET", "OPTIONS", "POST"]  # methods to retry
+    status_forcelist=[500, 502, 503, 504],  # retry on these statuses
+    allowed_methods=["HEAD", "GET", "OPTIONS", "POST"],  # methods to retry
+    # Rate limits (429, or a Retry-After header) are left to rate_limited_get,
+    # which reads GitHub's rate limit headers and waits without holding a
+    # request slot
+    respect_retry_after_header=False
 )
 
-# Mount to session
-adapter = HTTPAdapter(max_retries=retry_strategy)
+
+class BoundedHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter that limits how many requests are in flight at once across threads"""
+
+    def __init__(self, max_in_flight: int, **kwargs):
+        self.request_slots = threading.BoundedSemaphore(max_in_flight)
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        with self.request_slots:
+            return super().send(request, **kwargs)
+
+
+# Mount to session. The pool keeps one connection alive per request slot
+adapter = BoundedHTTPAdapter(
+    MAX_CONCURRENT_REQUESTS,
+    pool_maxsize=MAX_CONCURRENT_REQUESTS,
+    max_retries=retry_strategy
+)
 session = requests.Session()
 session.mount("http://", adapter)
 session.mount("https://", adapter)
 
+# Build progress is reported through this logger; LOG_LEVEL=DEBUG adds the
+# per-language messages, LOG_LEVEL=WARNING keeps only problems
+logger = logging.getLogger('build')
+
 # Debug/test mode flag
 # DEBUG_MODE = os.environ.get('DEBUG_MODE', '').lower() in ('true', '1', 'yes')
 DEBUG_MODE = False
 
 # GitHub token from environment - try manage-aquifer first, then GITHUB_AQUIFER_API_KEY
 GITHUB_TOKEN = os.environ.get('manage-aquifer', '') or os.environ.get('GITHUB_AQUIFER_API_KEY', '')
+# Further tokens (comma-separated) to spread requests over several rate limits
+GITHUB_TOKENS = [GITHUB_TOKEN] if GITHUB_TOKEN else []
+for extra_token in os.environ.get('GITHUB_TOKENS', '').split(','):
+    extra_token = extra_token.strip()
+    if extra_token and extra_token not in GITHUB_TOKENS:
+        GITHUB_TOKENS.append(extra_token)
+GITHUB_TOKEN = GITHUB_TOKEN or (GITHUB_TOKENS[0] if GITHUB_TOKENS else '')
+
+
+class TokenRotationAuth(AuthBase):
+    """Authenticate each request with the next token in turn, skipping tokens
+    whose rate limit is used up until it resets"""
+
+    def __init__(self, tokens: List[str]):
+        self.tokens = deque(tokens)
+        self.exhausted_until: Dict[str, float] = {}
+        self.lock = threading.Lock()
+
+    def next_token(self) -> str:
+        """Return the next usable token, waiting for a reset if all are used up"""
+        with self.lock:
+            now = time.time()
+            for _ in range(len(self.tokens)):
+                token = self.tokens[0]
+                self.tokens.rotate(-1)
+                if self.exhausted_until.get(token, 0) <= now:
+                    return token
+            token = min(self.tokens, key=lambda t: self.exhausted_until[t])
+            wait_time = self.exhausted_until[token] - now
+
+        if 0 < wait_time < 3600:  # Only wait if less than 1 hour
+            logger.warning(f"All GitHub tokens are rate limited. Waiting {wait_time:.0f} seconds for a reset...")
+            time.sleep(wait_time + 1)
+        return token
+
+    def record_rate_limit(self, token: str, response: requests.Response) -> None:
+        """Mark a token as used up when a REST response says its limit is reached"""
+        # GraphQL has its own limit; only the core REST limit gates the token here
+        if response.headers.get('X-RateLimit-Resource', 'core') != 'core':
+            return
+        reset_time = None
+        if response.headers.get('X-RateLimit-Remaining') == '0':
+            reset_time = float(response.headers.get('X-RateLimit-Reset', 0))
+        elif response.status_code in (403, 429) and response.headers.get('Retry-After'):
+            reset_time = time.time() + float(response.headers['Retry-After'])
+        if reset_time is not None:
+            with self.lock:
+                self.exhausted_until[token] = reset_time
+
+    def __call__(self, request):
+        token = self.next_token()
+        request.headers['Authorization'] = f'token {token}'
+        request.register_hook(
+            'response',
+            lambda response, *args, **kwargs: self.record_rate_limit(token, response)
+        )
+        return request
+
+
+# Send the API headers with every request made through the session, and
+# rotate through the available tokens for authentication
+session.headers.update({
+    'Accept': 'application/vnd.github+json',
+    'X-GitHub-Api-Version': '2022-11-28'
+})
+if GITHUB_TOKENS:
+    session.auth = TokenRotationAuth(GITHUB_TOKENS)
+
+# Conditional request cache. ETags of earlier responses are persisted between
+# builds (see load_etag_cache/save_etag_cache) so that unchanged resources are
+# answered with a 304, which does not count against the API rate limit.
+CACHE_DIR = os.path.join(os.path.dirname(__file__), '..', '.cache')
+ETAG_CACHE_FILE = os.path.join(CACHE_DIR, 'etags.json')
+RESPONSE_CACHE_DIR = os.path.join(CACHE_DIR, 'responses')
+etag_cache: Dict[str, Dict[str, Any]] = {}
+etag_cache_lock = threading.Lock()
+
+
+def load_etag_cache() -> None:
+    """Load the ETag cache index written by a previous build"""
+    try:
+        with open(ETAG_CACHE_FILE, encoding='utf-8') as f:
+            entries = json.load(f)
+    except (OSError, ValueError):
+        return
+    with etag_cache_lock:
+        etag_cache.update(entries)
 
-def get_headers():
-    """Get headers for GitHub API requests"""
-    headers = {}
-    if GITHUB_TOKEN:
-        headers['Authorization'] = f'token {GITHUB_TOKEN}'
-    return headers
 
+def save_etag_cache() -> None:
+    """Write the ETag cache index for the next build"""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    with etag_cache_lock:
+        entries = dict(etag_cache)
+    with open(ETAG_CACHE_FILE, 'w', encoding='utf-8') as f:
+        json.dump(entries, f, indent=1, sort_keys=True)
+
+
+# How often a request is retried after hitting a rate limit
+MAX_RATE_LIMIT_RETRIES = 5
+
+
+def get_rate_limit_wait(response: requests.Response, attempt: int) -> Optional[float]:
+    """Return how long to wait before retrying a rate-limited response, or None
+    if the response is not a rate limit (or is not worth waiting for)"""
+    if response.status_code not in (403, 429):
+        return None
+
+    retry_after = response.headers.get('Retry-After')
+    if retry_after:
+        return float(retry_after)
+
+    if response.headers.get('X-RateLimit-Remaining') == '0':
+        # The token rotation skips the exhausted token, or waits for its reset
+        if isinstance(session.auth, TokenRotationAuth):
+            return 0
+        wait_time = max(0, float(response.headers.get('X-RateLimit-Reset', 0)) - time.time())
+        return wait_time + 1 if wait_time < 3600 else None  # Only wait if less than 1 hour
+
+    # Secondary rate limits without Retry-After: back off exponentially with jitter
+    if 'rate limit' in response.text.lower():
+        return 60 * 2 ** attempt + random.uniform(0, 10)
+    return None
+
+
+def rate_limited_get(url: str, **kwargs) -> requests.Response:
+    """GET a URL through the session, waiting out GitHub rate limits before retrying"""
+    for attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
+        response = session.get(url, **kwargs)
+        wait_time = get_rate_limit_wait(response, attempt)
+        if wait_time is None or attempt == MAX_RATE_LIMIT_RETRIES:
+            break
+        if wait_time > 0:
+            logger.warning(f"Rate limited on {url}. Waiting {wait_time:.0f} seconds before retrying...")
+            time.sleep(wait_time)
+    return response
+
+
+def cached_get(url: str) -> requests.Response:
+    """GET a URL through the session, revalidating any cached copy with If-None-Match.
+
+    A 304 response is turned into a 200 carrying the cached body, so callers
+    can treat both cases alike.
+    """
+    with etag_cache_lock:
+        entry = etag_cache.get(url)
+
+    headers = {'If-None-Match': entry['etag']} if entry else None
+    response = rate_limited_get(url, headers=headers)
+
+    if response.status_code == 304 and entry:
+        try:
+            with open(os.path.join(RESPONSE_CACHE_DIR, entry['file']), 'rb') as f:
+                content = f.read()
+        except OSError:
+            # Cached body is gone, fetch the resource again
+            with etag_cache_lock:
+                etag_cache.pop(url, None)
+            return rate_limited_get(url)
+        response.status_code = 200
+        response._content = content
+        # GitHub normally repeats the Link header on a 304; fall back to the cached one
+        if entry.get('link') and 'Link' not in response.headers:
+            response.headers['Link'] = entry['link']
+    elif response.status_code == 200 and response.headers.get('ETag'):
+        file_name = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        os.makedirs(RESPONSE_CACHE_DIR, exist_ok=True)
+        with open(os.path.join(RESPONSE_CACHE_DIR, file_name), 'wb') as f:
+            f.write(response.content)
+        with etag_cache_lock:
+            etag_cache[url] = {
+                'etag': response.headers['ETag'],
+                'file': file_name,
+                'link': response.headers.get('Link')
+            }
+
+    return response
 
-def check_rate_limit():
-    """Check GitHub API rate limit status"""
-    try:
-        response = session.get(f'{GITHUB_API}/rate_limit', headers=get_headers())
-        response.raise_for_status()
-    except (requests.exceptions.RequestException, requests.exceptions.ConnectionError) as e:
-        print(f"Error checking rate limit: {e}")
-        
-    if response.status_code == 200:
-        data = response.json()
-        core = data.get('resources', {}).get('core', {})
-        remaining = core.get('remaining', 0)
-        reset_time = core.get('reset', 0)
-        if remaining < 10:
-            import time
-            wait_time = max(0, reset_time - time.time())
-            print(f"WARNING: Only {remaining} API calls remaining. Rate limit resets in {wait_time:.0f} seconds.")
-            if wait_time > 0 and wait_time < 3600:  # Only wait if less than 1 hour
-                print(f"Waiting {wait_time:.0f} seconds for rate limit reset...")
-                time.sleep(wait_time + 5)  # Add 5 second buffer
-    return headers
 
 # Language code to name mapping
 LANGUAGE_MAP = {
@@ -183,7 +377,7 @@ ROMAN_SCRIPT_LANGUAGES = {
 
 def get_language_name(code: str) -> str:
     """Convert 3-letter language code to full name"""
-    return LANGUAGE_MAP.get(code, code.upper())
+    return LANGUAGE_MAP.get(code) or code.upper()
 
 
 def get_bible_book_name(code: str) -> str:
@@ -228,164 +422,162 @@ def transform_label(label: str, order: str, lang_code: str) -> str:
         return label
 
 
+def fetch_json(url: str, description: str, allow_404: bool = False) -> Any:
+    """GET a JSON document through the cache, or None if it cannot be fetched.
+
+    Failures are logged with the description; a 404 is returned as None
+    silently when allow_404 is set (e.g. a repository without releases).
+    """
+    try:
+        response = cached_get(url)
+        if allow_404 and response.status_code == 404:
+            return None
+        response.raise_for_status()
+        return response.json()
+    except (requests.exceptions.RequestException, ValueError) as e:
+        logger.error(f"Error retrieving {description}: {e}")
+        return None
+
+
+@functools.lru_cache(maxsize=1)
 def fetch_readme() -> str:
-    """Fetch README.md from organization profile"""
+    """Fetch README.md from organization profile (once per process; revalidated with its ETag across builds)"""
     url = f'https://raw.githubusercontent.com/{ORG_NAME}/{ORG_REPO_NAME}/main/{README_PATH}'
     try:
-        response = session.get(url, headers=get_headers())
+        response = cached_get(url)
         response.raise_for_status()
-    except (requests.exceptions.RequestException, requests.exceptions.ConnectionError) as e:
-        print(f"Error fetching README.md: {e}")
+    except requests.exceptions.RequestException as e:
+        logger.error(f"Error fetching README.md: {e}")
+        raise
     return response.text
 
 
+# Markdown patterns used by markdown_to_html. Inline spans may wrap onto the
+# next line of a paragraph but never cross a blank line, header or list item
+# (and link text never contains a bracket), so an unclosed `[`, `_` or
+# backtick only scans to the end of its block instead of the rest of the
+# document.
+MARKDOWN_TITLE_RE = re.compile(r'^# [^\n]+\n[^\n]+\n\n', re.MULTILINE)
+MARKDOWN_SOFT_BREAK = r'\n(?![ \t]*(?:\n|[-*] |## ))'
+MARKDOWN_LINK_PATTERN = rf'\[(?:[^\[\]\n]|{MARKDOWN_SOFT_BREAK})+\]\((?:[^()\n]|{MARKDOWN_SOFT_BREAK})+\)'
+# All inline elements in one alternation, converted in a single pass. Emphasis
+# may contain whole links (whose URLs may contain underscores) but not a bare `_`.
+MARKDOWN_INLINE_RE = re.compile(
+    rf'(?P<em_link>\[_(?P<em_link_text>(?:[^_\n]|{MARKDOWN_SOFT_BREAK})+)_\]\((?P<em_link_url>(?:[^)\n]|{MARKDOWN_SOFT_BREAK})+)\))'
+    rf'|(?P<link>\[(?P<link_text>(?:[^\[\]\n]|{MARKDOWN_SOFT_BREAK})+)\]\((?P<link_url>(?:[^()\n]|{MARKDOWN_SOFT_BREAK})+)\))'
+    rf'|(?P<em>_(?P<em_text>(?:{MARKDOWN_LINK_PATTERN}|(?!{MARKDOWN_LINK_PATTERN})(?:[^_\n]|{MARKDOWN_SOFT_BREAK}))+)_)'
+    rf'|(?P<code>`(?P<code_text>(?:[^`\n]|{MARKDOWN_SOFT_BREAK})+)`)'
+)
+
+
+def replace_markdown_inline(match: re.Match) -> str:
+    """Convert a single inline markdown element matched by MARKDOWN_INLINE_RE to HTML"""
+    kind = match.lastgroup
+    if kind == 'em_link':
+        return f'<a href="{match.group("em_link_url")}" target="_blank"><em>{match.group("em_link_text")}</em></a>'
+    if kind == 'link':
+        return f'<a href="{match.group("link_url")}" target="_blank">{match.group("link_text")}</a>'
+    if kind == 'em':
+        # Emphasis may wrap links and code
+        return f'<em>{MARKDOWN_INLINE_RE.sub(replace_markdown_inline, match.group("em_text"))}</em>'
+    return f'<code>{match.group("code_text")}</code>'
+
+
 def markdown_to_html(markdown: str) -> str:
     """Convert markdown to HTML"""
-    html = markdown
-    
     # Remove the first H1 header and its following line (subtitle) if present
-    html = re.sub(r'^# [^\n]+\n[^\n]+\n\n', '', html, flags=re.MULTILINE)
-    
-    # Convert headers (## Header)
-    html = re.sub(r'^## (.*$)', r'<h2>\1</h2>', html, flags=re.MULTILINE)
-    
-    # Store links temporarily to avoid underscore conflicts
-    links = []
-    link_index = 0
-    
-    # Extract and replace links with placeholders
-    def replace_link_with_em(match):
-        nonlocal link_index
-        text = match.group(1)
-        url = match.group(2)
-        placeholder = f'{{{{LINK{link_index}}}}}'
-        links.append({
-            'placeholder': placeholder,
-            'html': f'<a href="{url}" target="_blank"><em>{text}</em></a>'
-        })
-        link_index += 1
-        return placeholder
-    
-    def replace_link(match):
-        nonlocal link_index
-        text = match.group(1)
-        url = match.group(2)
-        placeholder = f'{{{{LINK{link_index}}}}}'
-        links.append({
-            'placeholder': placeholder,
-            'html': f'<a href="{url}" target="_blank">{text}</a>'
-        })
-        link_index += 1
-        return placeholder
-    
-    html = re.sub(r'\[_([^_]+)_\]\(([^)]+)\)', replace_link_with_em, html)
-    html = re.sub(r'\[([^\]]+)\]\(([^)]+)\)', replace_link, html)
-    
-    # Convert bold/italic _text_
-    html = re.sub(r'_([^_]+)_', r'<em>\1</em>', html)
-    
-    # Restore links
-    for link in links:
-        html = html.replace(link['placeholder'], link['html'])
-    
-    # Convert code `code`
-    html = re.sub(r'`([^`]+)`', r'<code>\1</code>', html)
-    
+    html = MARKDOWN_TITLE_RE.sub('', markdown)
+
+    # Convert links, emphasis (_text_) and code (`code`)
+    html = MARKDOWN_INLINE_RE.sub(replace_markdown_inline, html)
+
     # standardize emdashes
-    html = re.sub(r'—', r'&mdash;', html)
+    html = html.replace('—', '&mdash;')
     
-    # Split into paragraphs and wrap in <p> tags
+    # Split into paragraphs (<p>) and bullet lists (<ul>)
     lines = html.split('\n')
-    result = ''
-    in_paragraph = False
+    parts = []
+    open_block = None  # 'p' or 'ul' while a paragraph or list is open
     
     for line in lines:
+        # Convert headers (## Header)
+        if line.startswith('## '):
+            line = f'<h2>{line[3:]}</h2>'
         line = line.strip()
+        is_list_item = line.startswith(('- ', '* '))
+        
+        # Blank lines and headers end the open block, as does switching
+        # between paragraph text and list items
+        if open_block and (not line or line.startswith('<h2>') or (open_block == 'ul') != is_list_item):
+            parts.append(f'</{open_block}>\n')
+            open_block = None
         
         if not line:
-            if in_paragraph:
-                result += '</p>\n'
-                in_paragraph = False
             continue
         
         # Headers don't need paragraph wrapping
         if line.startswith('<h2>'):
-            if in_paragraph:
-                result += '</p>\n'
-                in_paragraph = False
-            result += line + '\n'
+            parts.append(line + '\n')
+        elif is_list_item:
+            if not open_block:
+                parts.append('<ul>\n')
+                open_block = 'ul'
+            parts.append(f'<li>{line[2:].strip()}</li>\n')
         else:
             # Regular text - wrap in paragraph
-            if not in_paragraph:
-                result += '<p>'
-                in_paragraph = True
+            if not open_block:
+                parts.append('<p>')
+                open_block = 'p'
             else:
-                result += ' '
-            result += line
+                parts.append(' ')
+            parts.append(line)
     
-    # Close any open paragraph
-    if in_paragraph:
-        result += '</p>\n'
+    # Close any open paragraph or list
+    if open_block:
+        parts.append(f'</{open_block}>\n')
     
-    return result
+    return ''.join(parts)
+
+
+README_SECTION_SPLIT_RE = re.compile(r'(?=<h2>)')
 
 
 def format_readme_sections(html: str) -> str:
     """Wrap each section in content-section div"""
-    sections = html.split('<h2>')
-    formatted_content = ''
-    
-    for i, section in enumerate(sections):
-        section = section.strip()
-        if section:
-            if i == 0:
-                # First section doesn't have an h2
-                if section:
-                    formatted_content += f'<section class="content-section">{section}</section>'
-            else:
-                # Add h2 back
-                formatted_content += f'<section class="content-section"><h2>{section}</section>'
-    
-    return formatted_content
+    # Split before each h2 so every section keeps its own heading
+    return ''.join(
+        f'<section class="content-section">{section.strip()}</section>'
+        for section in README_SECTION_SPLIT_RE.split(html)
+        if section.strip()
+    )
+
+
+def fetch_repository_page(url: str) -> requests.Response:
+    """Fetch one page of the organization's repository list"""
+    try:
+        response = cached_get(url)
+        response.raise_for_status()
+    except requests.exceptions.RequestException as e:
+        logger.error(f"Error retrieving repositories: {e}")
+        raise
+
+    return response
 
 
 def fetch_repositories() -> List[Dict[str, Any]]:
     """Fetch all repositories from the organization"""
-    all_repos = []
-    page = 1
-    per_page = 100
-    
-    while True:
-        try:
-            response = session.get(
-                f'{GITHUB_API}/orgs/{ORG_NAME}/repos?per_page={per_page}&page={page}',
-                headers=get_headers()
-            )
-            response.raise_for_status()
-        except (requests.exceptions.RequestException, requests.exceptions.ConnectionError) as e:
-            print(f"Error retrieving repositories: {e}")
-        
-        if response.status_code == 403:
-            # Check if it's a rate limit issue
-            check_rate_limit()
-            response = requests.get(
-                f'{GITHUB_API}/orgs/{ORG_NAME}/repos?per_page={per_page}&page={page}',
-                headers=get_headers()
-            )
-        
-        response.raise_for_status()
-        repos = response.json()
-        
-        if not repos:
-            break  # No more pages
-        
-        all_repos.extend(repos)
-        
-        # Check if there are more pages
-        if len(repos) < per_page:
-            break
-        
-        page += 1
+    repos_url = f'{GITHUB_API}/orgs/{ORG_NAME}/repos?per_page=100'
+    response = fetch_repository_page(f'{repos_url}&page=1')
+    all_repos = response.json()
+
+    # rel="last" gives the page count, so the remaining pages are fetched together
+    last_url = response.links.get('last', {}).get('url')
+    if last_url:
+        last_page = int(parse_qs(urlparse(last_url).query)['page'][0])
+        page_urls = [f'{repos_url}&page={page}' for page in range(2, last_page + 1)]
+        with ThreadPoolExecutor(max_workers=REPO_WORKERS) as executor:
+            for page_response in executor.map(fetch_repository_page, page_urls):
+                all_repos.extend(page_response.json())
     
     # Filter repos that are data repositories
     return [
@@ -399,66 +591,148 @@ def fetch_repositories() -> List[Dict[str, Any]]:
     ]
 
 
-def fetch_languages(repo_name: str) -> List[str]:
-    """Fetch available languages for a repository"""
-    try:
-        response = session.get(f'{GITHUB_API}/repos/{ORG_NAME}/{repo_name}/contents', headers=get_headers())
-        response.raise_for_status()
-    except (requests.exceptions.RequestException, requests.exceptions.ConnectionError) as e:
-        print(f"Error retrieving repository languages: {e}")
+def fetch_tree(repo_name: str, tree_sha: str = CONTENT_BRANCH, recursive: bool = False) -> Optional[Dict[str, Any]]:
+    """Fetch a Git tree of a repository (the content branch root by default)"""
+    url = f'{GITHUB_API}/repos/{ORG_NAME}/{repo_name}/git/trees/{tree_sha}'
+    if recursive:
+        url += '?recursive=1'
+    return fetch_json(url, f"tree for {repo_name}")
 
-    if response.status_code != 200:
+
+def get_tree_directories(tree: Optional[Dict[str, Any]], prefix: str = '') -> List[str]:
+    """List the directory paths of a Git tree, at most two levels deep.
+
+    Paths are returned in tree order and prefixed with `prefix` (used for
+    subtrees fetched on their own).
+    """
+    if not tree:
         return []
-    
-    contents = response.json()
-    
-    # Filter for directories with 3-letter codes
-    languages = [
-        item['name']
-        for item in contents
-        if item['type'] == 'dir' and len(item['name']) == 3
+
+    return [
+        prefix + entry['path']
+        for entry in tree.get('tree', [])
+        if entry.get('type') == 'tree' and (prefix + entry['path']).count('/') <= 1
     ]
-    
-    return languages
+
+
+def fetch_repo_directories(repo_name: str) -> Tuple[Optional[str], List[str]]:
+    """Fetch the top-level directories of a repository and the directories directly below them.
+
+    Returns the SHA of the root tree (which changes whenever any file in the
+    repository changes) together with the directory paths. Uses a single
+    recursive tree request. If GitHub truncates the recursive listing (very
+    large repositories), falls back to fetching the root tree and each language
+    subtree individually.
+    """
+    tree = fetch_tree(repo_name, recursive=True)
+    tree_sha = tree.get('sha') if tree else None
+    if not tree or not tree.get('truncated'):
+        return tree_sha, get_tree_directories(tree)
+
+    root = fetch_tree(repo_name)
+    entries = [entry for entry in (root or {}).get('tree', []) if entry.get('type') == 'tree']
+    with ThreadPoolExecutor(max_workers=LANGUAGE_WORKERS) as executor:
+        subtree_futures = {
+            entry['path']: executor.submit(fetch_tree, repo_name, entry['sha'])
+            for entry in entries
+            if len(entry['path']) == 3
+        }
+
+    directories = []
+    for entry in entries:
+        directories.append(entry['path'])
+        if entry['path'] in subtree_futures:
+            subtree = subtree_futures[entry['path']].result()
+            directories.extend(get_tree_directories(subtree, prefix=f"{entry['path']}/"))
+
+    return tree_sha, directories
+
+
+def get_languages(directories: List[str]) -> List[str]:
+    """Extract language codes (top-level 3-letter directories) from directory paths"""
+    return [path for path in directories if '/' not in path and len(path) == 3]
 
 
 def fetch_metadata(repo_name: str, language: str) -> Optional[Dict[str, Any]]:
     """Fetch metadata.json for a specific language"""
-    url = f'https://raw.githubusercontent.com/{ORG_NAME}/{repo_name}/main/{language}/metadata.json'
+    url = f'https://raw.githubusercontent.com/{ORG_NAME}/{repo_name}/{CONTENT_BRANCH}/{language}/metadata.json'
+    return fetch_json(url, f"`{repo_name}/{language}/metadata.json`")
+
+
+def fetch_metadata_batch(repo_name: str, languages: List[str]) -> Optional[Dict[str, Optional[Dict[str, Any]]]]:
+    """Fetch metadata.json for several languages in a single GraphQL query.
+
+    Returns a dict mapping each language to its metadata (None if the language
+    has no metadata.json), or None if the query could not be made. Languages
+    whose blob text GitHub truncates are left out so the caller can fetch them
+    individually.
+    """
+    # The GraphQL API requires authentication
+    if not GITHUB_TOKEN or not languages:
+        return None
+
+    fields = ' '.join(
+        f'f{i}: object(expression: "{CONTENT_BRANCH}:{lang}/metadata.json") {{ ... on Blob {{ text isTruncated }} }}'
+        for i, lang in enumerate(languages)
+    )
+    query = f'query($owner: String!, $name: String!) {{ repository(owner: $owner, name: $name) {{ {fields} }} }}'
     try:
-        response = session.get(url, headers=get_headers())
+        response = session.post(
+            GITHUB_GRAPHQL_API,
+            json={'query': query, 'variables': {'owner': ORG_NAME, 'name': repo_name}}
+        )
         response.raise_for_status()
-    except (requests.exceptions.RequestException, requests.exceptions.ConnectionError) as e:
-        print(f"Error retrieving `{repo_name}/{language}/metadata.json`")
-    
-    if response.status_code != 200:
+        data = response.json()
+    except (requests.exceptions.RequestException, ValueError) as e:
+        logger.error(f"Error retrieving metadata for {repo_name} via GraphQL: {e}")
         return None
-    
-    return response.json()
+
+    repository = (data.get('data') or {}).get('repository')
+    if data.get('errors') or repository is None:
+        logger.error(f"Error retrieving metadata for {repo_name} via GraphQL: {data.get('errors')}")
+        return None
+
+    metadata = {}
+    for i, lang in enumerate(languages):
+        blob = repository.get(f'f{i}')
+        if not blob or blob.get('text') is None:
+            metadata[lang] = None
+        elif not blob.get('isTruncated'):
+            try:
+                metadata[lang] = json.loads(blob['text'])
+            except ValueError:
+                metadata[lang] = None
+    return metadata
 
 
 def fetch_latest_release_tag(repo_name: str) -> Optional[str]:
     """Fetch the latest release tag for a repository"""
     url = f'{GITHUB_API}/repos/{ORG_NAME}/{repo_name}/releases/latest'
-    try:
-        response = session.get(url, headers=get_headers())
-        if response.status_code == 200:
-            return response.json().get('tag_name')
-    except requests.exceptions.RequestException:
-        pass
-    return None
+    release = fetch_json(url, f"latest release of {repo_name}", allow_404=True)
+    return release.get('tag_name') if release else None
 
 
-def check_directory_exists(repo_name: str, language: str, dir_name: str) -> bool:
-    """Check if a directory exists in the repository"""
-    url = f'{GITHUB_API}/repos/{ORG_NAME}/{repo_name}/contents/{language}/{dir_name}'
-    try:
-        response = session.get(url, headers=get_headers())
-        response.raise_for_status()
-    except (requests.exceptions.RequestException, requests.exceptions.ConnectionError) as e:
-        print(f"Skipping `{language}/{dir_name}` (does not exist)")
-        
-    return response.status_code == 200
+def get_nested(data: Any, path: str, default: Any = None) -> Any:
+    """Look up a dotted path such as 'copyright.holder.name' in nested dicts.
+
+    Returns default as soon as a level is missing or is not a dict (metadata
+    files sometimes hold null where an object is expected).
+    """
+    for key in path.split('.'):
+        if not isinstance(data, dict):
+            return default
+        data = data.get(key)
+    return default if data is None else data
+
+
+# Content JSON files: json/<numeric-prefix>.content.json. The numeric prefix may
+# be a plain integer (01, 001), a thousands-based number (0000, 1000), or a
+# dotted hierarchy (0.00, 1.01, etc.)
+CONTENT_JSON_RE = re.compile(r'^json/\d+(?:\.\d+)*\.content\.json$')
+# Book number at the start of a file name (01 in 01.content.json or 01GENBSB.SFM)
+BOOK_NUMBER_RE = re.compile(r'\d+(?:\.\d+)*')
+JSON_BOOK_NUMBER_RE = re.compile(r'^json/(\d+(?:\.\d+)*)')
+CAMEL_CASE_RE = re.compile(r'([A-Z])')
 
 
 def get_json_files_with_labels(metadata: Dict[str, Any], order: Optional[str] = None, lang_code: Optional[str] = None) -> List[Dict[str, str]]:
@@ -481,24 +755,18 @@ def get_json_files_with_labels(metadata: Dict[str, Any], order: Optional[str] =
     if not metadata:
         return []
     
-    scripture_burrito = metadata.get('scripture_burrito', {})
-    ingredients = scripture_burrito.get('ingredients', {})
+    ingredients = get_nested(metadata, 'scripture_burrito.ingredients', {})
     
     # Auto-detect order from metadata if not provided
     if order is None:
         resource_meta = metadata.get('resource_metadata', {})
         order = resource_meta.get('order', '')
     
-    # Pattern to match content JSON files: json/<numeric-prefix>.content.json
-    # Numeric prefix may be a plain integer (01, 001), a thousands-based number (0000, 1000),
-    # or a dotted hierarchy (0.00, 1.01, etc.)
-    content_json_pattern = re.compile(r'^json/[\d.]+\.content\.json$')
-    
     json_files = []
     for path, info in ingredients.items():
         if isinstance(info, dict) and info.get('mimeType') == 'text/json':
             # Only include files matching the content JSON pattern
-            if content_json_pattern.match(path):
+            if CONTENT_JSON_RE.match(path):
                 # Extract label from the first key in 'scope'
                 scope = info.get('scope', {})
                 raw_label = list(scope.keys())[0] if scope else path
@@ -515,6 +783,9 @@ def get_json_files_with_labels(metadata: Dict[str, Any], order: Optional[str] =
 
 KNOWN_FORMAT_DIRS = {'json', 'md', 'pdf', 'docx', 'usfm', 'usx', 'audio', 'alignments'}
 
+# Format directories checked for each language (in the order of the has_* flags)
+FORMAT_DIRS = ('json', 'md', 'pdf', 'docx', 'usx', 'usfm', 'audio', 'alignments')
+
 
 def get_format_paths_by_book(metadata: Dict[str, Any]) -> Dict[str, Dict[str, str]]:
     """Group all ingredient paths by book number and format directory.
@@ -530,7 +801,7 @@ def get_format_paths_by_book(metadata: Dict[str, Any]) -> Dict[str, Dict[str, st
     if not metadata:
         return {}
 
-    ingredients = metadata.get('scripture_burrito', {}).get('ingredients', {})
+    ingredients = get_nested(metadata, 'scripture_burrito.ingredients', {})
     result = {}
 
     for path in ingredients:
@@ -543,11 +814,11 @@ def get_format_paths_by_book(metadata: Dict[str, Any]) -> Dict[str, Dict[str, st
             continue
 
         filename = parts[-1]
-        match = re.match(r'^([\d.]+)', filename)
+        match = BOOK_NUMBER_RE.match(filename)
         if not match:
             continue
 
-        book_num = match.group(1)
+        book_num = match.group()
         if book_num not in result:
             result[book_num] = {}
         result[book_num][dir_name] = path
@@ -564,148 +835,244 @@ def get_first_json_path(metadata: Dict[str, Any]) -> Optional[str]:
     return json_files[0]['path'] if json_files else None
 
 
+def build_repository_data(repo: Dict[str, Any]) -> Tuple[Optional[Dict[str, Any]], List[Tuple[int, str]]]:
+    """Build the resource data for a single repository.
+
+    Returns the resource data (or None if the repository has no language with
+    metadata) together with the (level, message) progress messages for the
+    repository, so that the caller can log them in order once the work is done.
+    Repositories whose tree is unchanged since the last build reuse that
+    build's data and only refresh the repository details and release tag.
+    """
+    repo_name = repo['name']
+    log = [(logging.INFO, f"Processing {repo_name}...")]
+
+    tree_sha, directories = fetch_repo_directories(repo_name)
+
+    with repo_state_lock:
+        previous = repo_state.get(repo_name)
+    if tree_sha and previous and previous['tree_sha'] == tree_sha:
+        log.append((logging.INFO, "  Unchanged since the last build"))
+        resource_data = previous['resource']
+        if resource_data:
+            resource_data = {
+                **resource_data,
+                'description': repo['description'],
+                'url': repo['url'],
+                'release_tag': fetch_latest_release_tag(repo_name)
+            }
+        return resource_data, log
+
+    resource_data = build_repository_resource(repo, directories, log)
+    # Only remember complete results: a metadata file that failed to load
+    # must be fetched again next time even if the tree is unchanged
+    languages_built = set(resource_data['languages']) if resource_data else set()
+    if tree_sha and languages_built == set(get_languages(directories)):
+        with repo_state_lock:
+            repo_state[repo_name] = {'tree_sha': tree_sha, 'resource': resource_data}
+    return resource_data, log
+
+
+def build_repository_resource(repo: Dict[str, Any], directories: List[str],
+                              log: List[Tuple[int, str]]) -> Optional[Dict[str, Any]]:
+    """Build the resource data for a repository from its directories and metadata files"""
+    repo_name = repo['name']
+    languages = get_languages(directories)
+    if not languages:
+        log.append((logging.INFO, f"  No languages found for {repo_name}"))
+        return None
+
+    resource_data = {
+        'name': repo_name,
+        'description': repo['description'],
+        'url': repo['url'],
+        'languages': {}
+    }
+
+    # Issue the metadata and release requests concurrently. All metadata files
+    # are fetched in one GraphQL query; any the query could not return are
+    # fetched individually.
+    with ThreadPoolExecutor(max_workers=LANGUAGE_WORKERS) as executor:
+        release_future = executor.submit(fetch_latest_release_tag, repo_name)
+        all_metadata = fetch_metadata_batch(repo_name, languages) or {}
+        if all_metadata:
+            log.append((logging.DEBUG, f"  Fetched metadata for {', '.join(all_metadata)} in one GraphQL query"))
+        metadata_futures = {}
+        for lang in languages:
+            if lang not in all_metadata:
+                log.append((logging.DEBUG, f"  Fetching metadata for {lang} individually..."))
+                metadata_futures[lang] = executor.submit(fetch_metadata, repo_name, lang)
+        for lang, future in metadata_futures.items():
+            all_metadata[lang] = future.result()
+
+    directory_set = set(directories)
+
+    # for metadata that may be missing outside of English versions (e.g. adaptation_notice)
+    english_metadata = all_metadata.get('eng')
+
+    # Fetch latest release tag for this repo
+    resource_data['release_tag'] = release_future.result()
+
+    # Fetch metadata for each language
+    for lang in languages:
+        log.append((logging.DEBUG, f"  Processing metadata for {lang}..."))
+        metadata = all_metadata[lang]
+
+        if metadata:
+            resource_meta = metadata.get('resource_metadata', {})
+            license_meta = resource_meta.get('license_info', {})
+
+            # Get the resource title - only use resource_metadata/title
+            if lang == "eng":
+                title = resource_meta.get('title') or repo_name
+            else:
+                title = resource_meta.get('aquifer_name') or resource_meta.get('title')
+
+            # Get adaptation notice if available
+            adaptation_notice = resource_meta.get('adaptation_notice')
+            # if empty and there is English metadata, then get the English
+            if (adaptation_notice == "") and (english_metadata is not None):
+                adaptation_notice = english_metadata["resource_metadata"].get('adaptation_notice')
+
+            # Check for all format directories generically
+            format_checks = {
+                f'has_{format_name}': f'{lang}/{format_name}' in directory_set
+                for format_name in FORMAT_DIRS
+            }
+
+            # Get all JSON file paths with labels for preview file selector
+            # Pass language code for proper label transformation
+            json_files = get_json_files_with_labels(metadata, lang_code=lang)
+            first_json_path = json_files[0]['path'] if json_files else None
+
+            # Attach per-file format paths from ingredients
+            format_map = get_format_paths_by_book(metadata)
+            for entry in json_files:
+                match = JSON_BOOK_NUMBER_RE.match(entry['path'])
+                if match:
+                    book_num = match.group(1)
+                    formats = format_map.get(book_num, {})
+                    if formats:
+                        entry['formats'] = formats
+
+            resource_data['languages'][lang] = {
+                'code': lang,
+                'name': get_language_name(lang),
+                'title': title,
+                'version': resource_meta.get('version'),
+                'resource_type': resource_meta.get('resource_type') or resource_meta.get('aquifer_type'),
+                'content_type': resource_meta.get('content_type'),
+                'language': resource_meta.get('language'),
+                'first_json_path': first_json_path,
+                'json_files': json_files,
+                'citation': {
+                    'title': license_meta.get('title'),
+                    'copyright_statement': get_nested(license_meta, 'copyright.statement'),
+                    'copyright_dates': get_nested(license_meta, 'copyright.dates'),
+                    'copyright_holder': get_nested(license_meta, 'copyright.holder.name'),
+                    'license_name': None,
+                    'adaptation_notice': adaptation_notice
+                },
+                **format_checks  # Add all format availability flags
+            }
+
+            # Get license name
+            licenses = license_meta.get('licenses', [])
+            if licenses and isinstance(licenses, list) and len(licenses) > 0:
+                first_license = licenses[0]
+                lang_code = resource_meta.get('language', 'eng')
+                if isinstance(first_license, dict) and lang_code in first_license:
+                    resource_data['languages'][lang]['citation']['license_name'] = \
+                        first_license[lang_code].get('name')
+                elif isinstance(first_license, dict) and "eng" in first_license:
+                    resource_data['languages'][lang]['citation']['license_name'] = \
+                        first_license["eng"].get('name')
+
+            # Set the resource title from English metadata if available, otherwise use first language
+            if 'title' not in resource_data:
+                if lang == 'eng':
+                    # Prioritize English title
+                    resource_data['title'] = title
+                else:
+                    # Temporarily store title from non-English language
+                    resource_data['_temp_title'] = title
+
+    # Only add resources that have at least one language with metadata
+    if not resource_data['languages']:
+        return None
+
+    # If we didn't find English title, use the temporary title from first language
+    if 'title' not in resource_data:
+        if '_temp_title' in resource_data:
+            resource_data['title'] = resource_data['_temp_title']
+            del resource_data['_temp_title']
+        else:
+            # Default title to formatted repo name if no metadata title found
+            # Convert camelCase to Title Case
+            resource_data['title'] = CAMEL_CASE_RE.sub(r' \1', repo_name).strip()
+    # Clean up temporary title if it exists
+    elif '_temp_title' in resource_data:
+        del resource_data['_temp_title']
+
+    # Set top-level resource_type: prefer English, fall back to first language
+    eng_lang = resource_data['languages'].get('eng')
+    first_lang = next(iter(resource_data['languages'].values()))
+    resource_data['resource_type'] = (
+        (eng_lang or first_lang).get('resource_type') or 'Other'
+    )
+
+    return resource_data
+
+
+# Per-repository record of the root tree SHA and the resource data built from
+# it, so unchanged repositories can skip their metadata requests next time
+REPO_STATE_FILE = os.path.join(CACHE_DIR, 'repo_state.json')
+repo_state: Dict[str, Dict[str, Any]] = {}
+repo_state_lock = threading.Lock()
+
+
+def load_repo_state(generator_hash: str) -> None:
+    """Load the repository state saved by a previous build of the same generator"""
+    try:
+        with open(REPO_STATE_FILE, encoding='utf-8') as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return
+    # Data built by a different version of this script may have another shape
+    if state.get('generator') == generator_hash:
+        with repo_state_lock:
+            repo_state.update(state.get('repos', {}))
+
+
+def save_repo_state(generator_hash: str) -> None:
+    """Write the repository state for the next build"""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    with repo_state_lock:
+        state = {'generator': generator_hash, 'repos': dict(repo_state)}
+    with open(REPO_STATE_FILE, 'w', encoding='utf-8') as f:
+        json.dump(state, f, ensure_ascii=False)
+
+
 def build_resource_data() -> Dict[str, Any]:
     """Build complete resource data structure"""
-    print("Fetching repositories...")
+    logger.info("Fetching repositories...")
     repositories = fetch_repositories()
     
     resources = {}
     
-    for repo in repositories:
-        repo_name = repo['name']
-        print(f"Processing {repo_name}...")
-        
-        languages = fetch_languages(repo_name)
-        if not languages:
-            print(f"  No languages found for {repo_name}")
-            continue
-        
-        resource_data = {
-            'name': repo_name,
-            'description': repo['description'],
-            'url': repo['url'],
-            'languages': {}
-        }
-        # for metadata that may be missing outside of English versions (e.g. adaptation_notice)
-        english_metadata = fetch_metadata(repo_name, "eng")
-
-        # Fetch latest release tag for this repo
-        release_tag = fetch_latest_release_tag(repo_name)
-        resource_data['release_tag'] = release_tag
-
-        # Fetch metadata for each language
-        for lang in languages:
-            print(f"  Fetching metadata for {lang}...")
-            metadata = fetch_metadata(repo_name, lang)
-            
-            if metadata:
-                resource_meta = metadata.get('resource_metadata', {})
-                license_meta = resource_meta.get('license_info', {})
-                
-                # Get the resource title - only use resource_metadata/title
-                if lang == "eng":
-                    title = resource_meta.get('title') or repo_name
-                else:
-                    title = resource_meta.get('aquifer_name') or resource_meta.get('title')
-                
-                # Get adaptation notice if available
-                adaptation_notice = resource_meta.get('adaptation_notice')
-                # if empty and there is English metadata, then get the English
-                if (adaptation_notice == "") and (english_metadata is not None):
-                    adaptation_notice = english_metadata["resource_metadata"].get('adaptation_notice')
-                
-                # Check for all format directories generically
-                format_checks = {}
-                for format_name in ['json', 'md', 'pdf', 'docx', 'usx', 'usfm', 'audio', 'alignments']:
-                    format_checks[f'has_{format_name}'] = check_directory_exists(repo_name, lang, format_name)
-                
-                # Get all JSON file paths with labels for preview file selector
-                # Pass language code for proper label transformation
-                json_files = get_json_files_with_labels(metadata, lang_code=lang)
-                first_json_path = json_files[0]['path'] if json_files else None
-
-                # Attach per-file format paths from ingredients
-                format_map = get_format_paths_by_book(metadata)
-                for entry in json_files:
-                    match = re.match(r'^json/([\d.]+)', entry['path'])
-                    if match:
-                        book_num = match.group(1)
-                        formats = format_map.get(book_num, {})
-                        if formats:
-                            entry['formats'] = formats
-                
-                resource_data['languages'][lang] = {
-                    'code': lang,
-                    'name': get_language_name(lang),
-                    'title': title,
-                    'version': resource_meta.get('version'),
-                    'resource_type': resource_meta.get('resource_type') or resource_meta.get('aquifer_type'),
-                    'content_type': resource_meta.get('content_type'),
-                    'language': resource_meta.get('language'),
-                    'first_json_path': first_json_path,
-                    'json_files': json_files,
-                    'citation': {
-                        'title': license_meta.get('title'),
-                        'copyright_statement': license_meta.get('copyright', {}).get('statement'),
-                        'copyright_dates': license_meta.get('copyright', {}).get('dates'),
-                        'copyright_holder': license_meta.get('copyright', {}).get('holder', {}).get('name'),
-                        'license_name': None,
-                        'adaptation_notice': adaptation_notice
-                    },
-                    **format_checks  # Add all format availability flags
-                }
-                
-                # Get license name
-                licenses = license_meta.get('licenses', [])
-                if licenses and isinstance(licenses, list) and len(licenses) > 0:
-                    first_license = licenses[0]
-                    lang_code = resource_meta.get('language', 'eng')
-                    if isinstance(first_license, dict) and lang_code in first_license:
-                        resource_data['languages'][lang]['citation']['license_name'] = \
-                            first_license[lang_code].get('name')
-                    elif isinstance(first_license, dict) and "eng" in first_license:
-                        resource_data['languages'][lang]['citation']['license_name'] = \
-                            first_license["eng"].get('name')
-                
-                # Set the resource title from English metadata if available, otherwise use first language
-                if 'title' not in resource_data:
-                    if lang == 'eng':
-                        # Prioritize English title
-                        resource_data['title'] = title
-                    else:
-                        # Temporarily store title from non-English language
-                        resource_data['_temp_title'] = title
-        
-        # Only add resources that have at least one language with metadata
-        if resource_data['languages']:
-            # If we didn't find English title, use the temporary title from first language
-            if 'title' not in resource_data:
-                if '_temp_title' in resource_data:
-                    resource_data['title'] = resource_data['_temp_title']
-                    del resource_data['_temp_title']
-                else:
-                    # Default title to formatted repo name if no metadata title found
-                    # Convert camelCase to Title Case
-                    resource_data['title'] = re.sub(r'([A-Z])', r' \1', repo_name).strip()
-            # Clean up temporary title if it exists
-            elif '_temp_title' in resource_data:
-                del resource_data['_temp_title']
-
-            # Set top-level resource_type: prefer English, fall back to first language
-            eng_lang = resource_data['languages'].get('eng')
-            first_lang = next(iter(resource_data['languages'].values()))
-            resource_data['resource_type'] = (
-                (eng_lang or first_lang).get('resource_type') or 'Other'
-            )
-
-            resources[repo_name] = resource_data
+    # Repositories are processed concurrently; results (and their progress
+    # messages) are collected in the original repository order
+    with ThreadPoolExecutor(max_workers=REPO_WORKERS) as executor:
+        for repo, (resource_data, log) in zip(repositories, executor.map(build_repository_data, repositories)):
+            for level, message in log:
+                logger.log(level, message)
+            if resource_data:
+                resources[repo['name']] = resource_data
     
     return resources
 
 
-def generate_index_html(readme_html: str) -> str:
-    """Generate index.html with embedded README content"""
-    template = """<!DOCTYPE html>
+INDEX_TEMPLATE = """<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
@@ -729,7 +1096,7 @@ def generate_index_html(readme_html: str) -> str:
 
     <main class="container">
         <div id="dynamic-content">
-{{ content }}
+{{ content|safe }}
         </div>
 
         <section class="cta-section">
@@ -749,16 +1116,53 @@ def generate_index_html(readme_html: str) -> str:
 </body>
 </html>
 """
-    
-    t = Template(template)
+
+
+def generate_index_html(readme_html: str) -> str:
+    """Generate index.html with embedded README content"""
+    t = TEMPLATE_ENV.get_template('index.html')
     build_version = datetime.now(timezone.utc).strftime("%Y-%m-%d@%H:%M:%S")
     build_year = datetime.now(timezone.utc).year
     return t.render(content=readme_html, build_version=build_version, build_year=build_year)
 
 
-def generate_catalog_html(resources: Dict[str, Any]) -> str:
-    """Generate catalog.html with pre-populated resource data"""
-    template = """<!DOCTYPE html>
+def group_resources_by_type(resources: Dict[str, Any]) -> List[Tuple[str, List[Dict[str, Any]]]]:
+    """Group resources by resource type for the catalog resource dropdown.
+
+    Groups are ordered by type and the resources within a group by title,
+    both case-insensitively.
+    """
+    by_type = sorted(resources.values(), key=lambda resource: resource['resource_type'].lower())
+    return [
+        (group[0]['resource_type'], sorted(group, key=lambda resource: resource['title'].lower()))
+        for group in (
+            list(items)
+            for _, items in groupby(by_type, key=lambda resource: resource['resource_type'].lower())
+        )
+    ]
+
+
+def get_catalog_language_names(resources: Dict[str, Any]) -> Dict[str, str]:
+    """Map the language codes used by the resources to their names, for the catalog page script"""
+    return {
+        lang_code: get_language_name(lang_code)
+        for lang_code in sorted({
+            lang_code
+            for resource_data in resources.values()
+            for lang_code in resource_data.get('languages', {})
+        })
+    }
+
+
+def serialize_script_json(data: Any) -> str:
+    """Serialize data compactly as JSON for embedding in a <script> block.
+
+    "</" is escaped so that strings in the data cannot close the script element.
+    """
+    return json.dumps(data, separators=(',', ':'), ensure_ascii=False).replace('</', '<\\/')
+
+
+CATALOG_TEMPLATE = """<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
@@ -794,9 +1198,9 @@ def generate_catalog_html(resources: Dict[str, Any]) -> str:
                     <label for="resource-select">Select Resource:</label>
                     <select id="resource-select">
                         <option value="">Select a resource...</option>
-{%- for group_name, group_resources in resources.values() | groupby('resource_type') %}
+{%- for group_name, group_resources in resource_groups %}
                         <optgroup label="{{ group_name }}">
-{%- for resource in group_resources | sort(attribute='title') %}
+{%- for resource in group_resources %}
                         <option value="{{ resource.name }}">{{ resource.title }}</option>
 {%- endfor %}
                         </optgroup>
@@ -858,8 +1262,9 @@ def generate_catalog_html(resources: Dict[str, Any]) -> str:
     </footer>
 
     <script>
-// Resource data embedded from YAML
-const RESOURCES_DATA = {{ resources_json }};
+// Resource data embedded from the build
+const RESOURCES_DATA = {{ resources_json|safe }};
+const LANGUAGE_NAMES = {{ language_names_json|safe }};
 const ORG_NAME = '{{ org_name }}';
 
 // DOM elements
@@ -896,6 +1301,11 @@ function isRtlLanguage(langCode) {
     return RTL_LANGUAGES.includes(langCode);
 }
 
+// Get the display name of a language code
+function getLanguageName(langCode) {
+    return LANGUAGE_NAMES[langCode] || langCode.toUpperCase();
+}
+
 // Load nav data (json_files) for a resource+language combination
 async function loadNavData(resourceName, langCode) {
     const cacheKey = `${resourceName}_${langCode}`;
@@ -1304,7 +1714,7 @@ async function handleResourceChange() {
     languageSelect.innerHTML = '<option value="">Select a language...</option>';
     
     const languages = Object.values(selectedResource.languages).sort((a, b) => 
-        a.name.localeCompare(b.name)
+        getLanguageName(a.code).localeCompare(getLanguageName(b.code))
     );
     
     const hasEng = languages.some(lang => lang.code === 'eng');
@@ -1315,7 +1725,7 @@ async function handleResourceChange() {
     languages.forEach(lang => {
         const option = document.createElement('option');
         option.value = lang.code;
-        option.textContent = lang.name;
+        option.textContent = getLanguageName(lang.code);
         if (lang.code === defaultLang) {
             option.selected = true;
         }
@@ -1374,53 +1784,45 @@ function displayLanguageMetadata() {
         return;
     }
     
-    let html = '';
-    
-    // Display resource title and description at the top
-    //    html += `<div class="resource-header">`;
-    //    html += `<h3>${selectedResource.title}</h3>`;
-    //    html += `<p>${selectedResource.description || 'No description available'}</p>`;
-    //    html += `<p><a href="${selectedResource.url}" target="_blank">View on GitHub</a></p>`;
-    //    html += `</div>`;
-    //    html += '<hr style="margin: 1.5rem 0;">';
+    const parts = [];
     
     // Display citation if available
     if (langData.citation && (langData.citation.title || langData.citation.copyright_statement)) {
-        html += '<h3>Citation</h3>';
+        parts.push('<h3>Citation</h3>');
 
         if (langData.citation.copyright_statement) {
             // Use the licensor-provided statement directly (trusted HTML from metadata)
-            html += `<div class="citation">${langData.citation.copyright_statement}</div>`;
+            parts.push(`<div class="citation">${langData.citation.copyright_statement}</div>`);
         } else {
-            html += '<p class="citation">';
-            html += `<em>${langData.citation.title}</em>`;
+            parts.push('<p class="citation">');
+            parts.push(`<em>${langData.citation.title}</em>`);
 
             if (langData.citation.copyright_holder) {
-                html += `. &copy; ${langData.citation.copyright_dates || ''} ${langData.citation.copyright_holder}`;
+                parts.push(`. &copy; ${langData.citation.copyright_dates || ''} ${langData.citation.copyright_holder}`);
             }
 
             if (langData.citation.license_name) {
-                html += `. Licensed under ${langData.citation.license_name}`;
+                parts.push(`. Licensed under ${langData.citation.license_name}`);
             }
 
-            html += '.</p>';
+            parts.push('.</p>');
         }
 
         // Add adaptation notice if available
         if (langData.citation.adaptation_notice) {
-            html += `<div class="adaptation-notice">${langData.citation.adaptation_notice}</div>`;
+            parts.push(`<div class="adaptation-notice">${langData.citation.adaptation_notice}</div>`);
         }
 
-        html += '<hr style="margin: 1.5rem 0;">';
+        parts.push('<hr style="margin: 1.5rem 0;">');
     }
     
     // Create two-column layout for Resource Information and Access Resource
-    html += '<div class="resource-details-columns">';
+    parts.push('<div class="resource-details-columns">');
     
     // Left column: Resource Information
-    html += '<div class="resource-info-column">';
-    html += '<h3>Resource Information</h3>';
-    html += '<div class="metadata-grid">';
+    parts.push('<div class="resource-info-column">');
+    parts.push('<h3>Resource Information</h3>');
+    parts.push('<div class="metadata-grid">');
     
     const metadataFields = [
         { label: 'Title', value: langData.title },
@@ -1433,21 +1835,21 @@ function displayLanguageMetadata() {
     
     metadataFields.forEach(field => {
         if (field.value) {
-            html += `
+            parts.push(`
                 <div class="metadata-label">${field.label}:</div>
                 <div class="metadata-value">${field.value}</div>
-            `;
+            `);
         }
     });
     
-    html += '</div>';
-    html += '</div>'; // Close resource-info-column
+    parts.push('</div>');
+    parts.push('</div>'); // Close resource-info-column
     
     // Right column: Access Resource
-    html += '<div class="resource-access-column">';
-    html += '<h3>Access Resource</h3>';
-    html += '<p>Browse or download this resource:</p>';
-    html += '<ul class="download-list">';
+    parts.push('<div class="resource-access-column">');
+    parts.push('<h3>Access Resource</h3>');
+    parts.push('<p>Browse or download this resource:</p>');
+    parts.push('<ul class="download-list">');
     
     // Dynamically check and add links for all available formats
     const formats = [
@@ -1465,33 +1867,59 @@ function displayLanguageMetadata() {
     formats.forEach(format => {
         if (langData[format.key]) {
             const dirName = format.key.replace('has_', '');
-            html += `<li><a href="https://github.com/${ORG_NAME}/${selectedResource.name}/tree/main/${selectedLanguage}/${dirName}" target="_blank">${format.label}</a></li>`;
+            parts.push(`<li><a href="https://github.com/${ORG_NAME}/${selectedResource.name}/tree/main/${selectedLanguage}/${dirName}" target="_blank">${format.label}</a></li>`);
         }
     });
     
-    html += `<li><a href="https://github.com/${ORG_NAME}/${selectedResource.name}/releases/latest" target="_blank">Download latest release</a></li>`;
-    html += '</ul>';
-    html += '</div>'; // Close resource-access-column
-    html += '</div>'; // Close resource-details-columns
+    parts.push(`<li><a href="https://github.com/${ORG_NAME}/${selectedResource.name}/releases/latest" target="_blank">Download latest release</a></li>`);
+    parts.push('</ul>');
+    parts.push('</div>'); // Close resource-access-column
+    parts.push('</div>'); // Close resource-details-columns
     
-    contentDisplayDiv.innerHTML = html;
+    contentDisplayDiv.innerHTML = parts.join('');
     contentViewerSection.classList.remove('hidden');
 }
     </script>
 </body>
 </html>
 """
-    
-    t = Template(template)
-    build_version = datetime.now(timezone.utc).strftime("%Y-%m-%d@%H:%M:%S")
-    build_year = datetime.now(timezone.utc).year
-    return t.render(
-        resources=resources,
-        resources_json=json.dumps(resources, indent=2),
-        org_name=ORG_NAME,
-        build_version=build_version,
-        build_year=build_year
-    )
+
+# Templates are compiled once per process. Autoescaping is on, so values that
+# are already HTML or JSON must be marked |safe in the templates.
+TEMPLATE_ENV = Environment(
+    loader=DictLoader({'index.html': INDEX_TEMPLATE, 'catalog.html': CATALOG_TEMPLATE}),
+    autoescape=True,
+    auto_reload=False,
+    cache_size=-1
+)
+
+
+def get_catalog_template_context(resources: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the variables the catalog.html template is rendered with"""
+    return {
+        'resource_groups': group_resources_by_type(resources),
+        'resources_json': serialize_script_json(resources),
+        'language_names_json': serialize_script_json(get_catalog_language_names(resources)),
+        'org_name': ORG_NAME,
+        'build_version': datetime.now(timezone.utc).strftime("%Y-%m-%d@%H:%M:%S"),
+        'build_year': datetime.now(timezone.utc).year
+    }
+
+
+def generate_catalog_html(resources: Dict[str, Any]) -> str:
+    """Generate catalog.html with pre-populated resource data"""
+    t = TEMPLATE_ENV.get_template('catalog.html')
+    return t.render(**get_catalog_template_context(resources))
+
+
+def write_catalog_html(resources: Dict[str, Any], path: str) -> None:
+    """Render catalog.html straight into a file.
+
+    The page is streamed to disk as it renders, so the full HTML (which embeds
+    all resource data) is never held in memory as one string.
+    """
+    t = TEMPLATE_ENV.get_template('catalog.html')
+    t.stream(**get_catalog_template_context(resources)).dump(path, encoding='utf-8')
 
 
 def generate_nav_files(resources: Dict[str, Any], output_dir: str) -> None:
@@ -1513,94 +1941,240 @@ def generate_nav_files(resources: Dict[str, Any], output_dir: str) -> None:
                     json.dump(json_files, f)
                 file_count += 1
     
-    print(f"  Generated {file_count} nav files in nav/ folder")
+    logger.info(f"  Generated {file_count} nav files in nav/ folder")
+
+
+# Fields of the resource data that the catalog page script reads. Everything
+# else (json_files, description, url) is left out of the embedded data, and
+# language names are embedded once (see get_catalog_language_names).
+CATALOG_RESOURCE_FIELDS = ('name', 'title', 'release_tag', 'resource_type')
+CATALOG_LANGUAGE_FIELDS = (
+    'code', 'title', 'version', 'resource_type', 'content_type',
+    'language', 'first_json_path'
+) + tuple(f'has_{format_name}' for format_name in FORMAT_DIRS)
 
 
 def get_catalog_resources(resources: Dict[str, Any]) -> Dict[str, Any]:
-    """Create a copy of resources with json_files removed for embedding in catalog.html.
-    
-    This reduces the catalog.html file size by excluding the json_files data,
-    which is now loaded dynamically from the nav/ folder.
+    """Project resources down to the fields the catalog page uses, for embedding in catalog.html.
+
+    json_files is loaded dynamically from the nav/ folder instead. Empty
+    values (None, False, '') are dropped too, since the page script only
+    tests fields for truthiness.
     """
-    import copy
-    catalog_resources = copy.deepcopy(resources)
-    
-    for resource_name, resource_data in catalog_resources.items():
+    catalog_resources = {}
+
+    for resource_name, resource_data in resources.items():
+        catalog_resource = {
+            field: resource_data[field]
+            for field in CATALOG_RESOURCE_FIELDS
+            if resource_data.get(field)
+        }
+        catalog_resource['languages'] = {}
         for lang_code, lang_data in resource_data.get('languages', {}).items():
-            # Remove json_files from the embedded data
-            if 'json_files' in lang_data:
-                del lang_data['json_files']
-    
+            catalog_language = {
+                field: lang_data[field]
+                for field in CATALOG_LANGUAGE_FIELDS
+                if lang_data.get(field)
+            }
+            citation = {key: value for key, value in (lang_data.get('citation') or {}).items() if value}
+            if citation:
+                catalog_language['citation'] = citation
+            catalog_resource['languages'][lang_code] = catalog_language
+        catalog_resources[resource_name] = catalog_resource
+
     return catalog_resources
 
 
+# Hashes of the inputs and outputs of the last build, used to skip unchanged outputs
+BUILD_HASHES_FILE = os.path.join(CACHE_DIR, 'build_hashes.json')
+
+
+def compute_hash(*parts: str) -> str:
+    """Compute a SHA-256 hex digest over one or more strings"""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+def load_build_hashes() -> Dict[str, str]:
+    """Load the input hashes recorded by the previous build"""
+    try:
+        with open(BUILD_HASHES_FILE, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_build_hashes(hashes: Dict[str, str]) -> None:
+    """Record the input hashes of this build"""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    with open(BUILD_HASHES_FILE, 'w', encoding='utf-8') as f:
+        json.dump(hashes, f, indent=1, sort_keys=True)
+
+
+def compute_output_hash(path: str) -> Optional[str]:
+    """Hash the content of an output file, or of every file in an output
+    directory; None if the output does not exist"""
+    digest = hashlib.sha256()
+    try:
+        if os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                digest.update(name.encode('utf-8') + b'\0')
+                with open(os.path.join(path, name), 'rb') as f:
+                    digest.update(f.read())
+                digest.update(b'\0')
+        else:
+            with open(path, 'rb') as f:
+                digest.update(f.read())
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+def get_output_hash_key(path: str) -> str:
+    """Key under which the content hash of an output is recorded"""
+    return f'output:{os.path.basename(os.path.normpath(path))}'
+
+
+def is_up_to_date(name: str, input_hash: str, previous_hashes: Dict[str, str], outputs: List[str]) -> bool:
+    """Check whether outputs were built from the same inputs and are unchanged since.
+
+    Outputs that were edited or replaced after the last build (e.g. by
+    generate_sample.py, which writes to the same files) no longer match their
+    recorded hash and are regenerated.
+    """
+    if previous_hashes.get(name) != input_hash:
+        return False
+    for path in outputs:
+        output_hash = compute_output_hash(path)
+        if output_hash is None or previous_hashes.get(get_output_hash_key(path)) != output_hash:
+            return False
+    return True
+
+
 def main():
     """Main build process"""
-    print("=" * 60)
-    print("Building BibleAquifer Static Site")
-    print("=" * 60)
+    parser = argparse.ArgumentParser(description='Build the BibleAquifer static site')
+    parser.add_argument('--force', action='store_true',
+                        help='regenerate all outputs even if their inputs are unchanged')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=os.environ.get('LOG_LEVEL', 'INFO').upper(), format='%(message)s')
+
+    logger.info("=" * 60)
+    logger.info("Building BibleAquifer Static Site")
+    logger.info("=" * 60)
     
     # Check for GitHub token - must have manage-aquifer or GITHUB_AQUIFER_API_KEY
     if not GITHUB_TOKEN and not DEBUG_MODE:
-        print("\nERROR: Required GitHub token not found.")
-        print("Please set one of the following environment variables:")
-        print("  - manage-aquifer")
-        print("  - GITHUB_AQUIFER_API_KEY")
-        print("\nAlternatively, set DEBUG_MODE=true to use test data.")
-        print("\nExample: export manage-aquifer=your_token_here")
+        logger.error("\nERROR: Required GitHub token not found.")
+        logger.error("Please set one of the following environment variables:")
+        logger.error("  - manage-aquifer")
+        logger.error("  - GITHUB_AQUIFER_API_KEY")
+        logger.error("  - GITHUB_TOKENS (comma-separated, to rotate through several tokens)")
+        logger.error("\nAlternatively, set DEBUG_MODE=true to use test data.")
+        logger.error("\nExample: export manage-aquifer=your_token_here")
         exit(1)
     
     if DEBUG_MODE:
-        print("\nDEBUG MODE: Running with test/sample data")
+        logger.info("\nDEBUG MODE: Running with test/sample data")
+    elif len(GITHUB_TOKENS) > 1:
+        logger.info(f"\nUsing {len(GITHUB_TOKENS)} GitHub tokens for API access")
     elif GITHUB_TOKEN:
-        print(f"\nUsing GitHub token for API access")
+        logger.info(f"\nUsing GitHub token for API access")
     
+    with open(__file__, encoding='utf-8') as f:
+        generator_hash = compute_hash(f.read())
+
+    # Reuse ETags and unchanged repositories from the previous build
+    load_etag_cache()
+    if not args.force:
+        load_repo_state(generator_hash)
+
     # Fetch and process README
-    print("\n1. Fetching README from organization profile...")
+    logger.info("\n1. Fetching README from organization profile...")
     readme_md = fetch_readme()
-    readme_html = markdown_to_html(readme_md)
-    readme_formatted = format_readme_sections(readme_html)
     
     # Build resource data
-    print("\n2. Building resource data...")
+    logger.info("\n2. Building resource data...")
     resources = build_resource_data()
     
-    print(f"\nFound {len(resources)} resources with metadata")
+    logger.info(f"\nFound {len(resources)} resources with metadata")
+    save_etag_cache()
+    save_repo_state(generator_hash)
     
-    # Save resource data to YAML for reference
-    print("\n3. Saving resource data to YAML...")
+    # Outputs are only regenerated when their inputs (or this script, which
+    # holds the templates) changed since the last build
     output_dir = os.path.join(os.path.dirname(__file__), '..')
-    with open(os.path.join(output_dir, 'resources_data.yaml'), 'w') as f:
-        yaml.dump(resources, f, default_flow_style=False, sort_keys=False)
+    previous_hashes = {} if args.force else load_build_hashes()
+    # Serialize the resource data once: the same text is hashed and saved
+    resources_json = json.dumps(resources, indent=2, ensure_ascii=False)
+    hashes = {
+        'index': compute_hash(generator_hash, readme_md),
+        'resources': compute_hash(generator_hash, resources_json)
+    }
+    resource_outputs = [
+        os.path.join(output_dir, 'resources_data.json'),
+        os.path.join(output_dir, 'catalog.html'),
+        os.path.join(output_dir, 'nav')
+    ]
+    resources_up_to_date = is_up_to_date('resources', hashes['resources'], previous_hashes, resource_outputs)
+
+    # Save resource data to JSON for reference
+    logger.info("\n3. Saving resource data to JSON...")
+    if resources_up_to_date:
+        logger.info("   Resource data unchanged, skipping")
+    else:
+        with open(os.path.join(output_dir, 'resources_data.json'), 'w', encoding='utf-8') as f:
+            f.write(resources_json)
     
     # Generate nav files for file selector (separate from catalog.html)
-    print("\n4. Generating nav files...")
-    generate_nav_files(resources, output_dir)
+    logger.info("\n4. Generating nav files...")
+    if resources_up_to_date:
+        logger.info("   Resource data unchanged, skipping")
+    else:
+        generate_nav_files(resources, output_dir)
     
     # Generate HTML files
-    print("\n5. Generating index.html...\n")
-    index_html = generate_index_html(readme_formatted)
-    with open(os.path.join(output_dir, 'index.html'), 'w') as f:
-        f.write(index_html)
-    
-    # Create catalog-specific resources without json_files to reduce file size
-    catalog_resources = get_catalog_resources(resources)
-    
-    print("6. Generating catalog.html...")
-    catalog_html = generate_catalog_html(catalog_resources)
-    with open(os.path.join(output_dir, 'catalog.html'), 'w', encoding="utf-8") as f:
-        f.write(catalog_html)
-    
-    print("\n" + "=" * 60)
-    print("Build complete!")
-    print("=" * 60)
-    print(f"Generated files:")
-    print("  - index.html")
-    print("  - catalog.html")
-    print("  - resources_data.yaml")
-    print("  - nav/*.json (file selector data)")
-    print()
+    logger.info("\n5. Generating index.html...\n")
+    index_outputs = [os.path.join(output_dir, 'index.html')]
+    if is_up_to_date('index', hashes['index'], previous_hashes, index_outputs):
+        logger.info("   README unchanged, skipping")
+    else:
+        readme_html = markdown_to_html(readme_md)
+        readme_formatted = format_readme_sections(readme_html)
+        index_html = generate_index_html(readme_formatted)
+        with open(os.path.join(output_dir, 'index.html'), 'w', encoding='utf-8') as f:
+            f.write(index_html)
+    
+    logger.info("6. Generating catalog.html...")
+    if resources_up_to_date:
+        logger.info("   Resource data unchanged, skipping")
+    else:
+        # Create catalog-specific resources without json_files to reduce file size
+        catalog_resources = get_catalog_resources(resources)
+        write_catalog_html(catalog_resources, os.path.join(output_dir, 'catalog.html'))
+
+    # Record what was written, so outputs overwritten by anything else are rebuilt
+    for path in resource_outputs + index_outputs:
+        hashes[get_output_hash_key(path)] = compute_output_hash(path)
+    save_build_hashes(hashes)
+    
+    logger.info("\n" + "=" * 60)
+    logger.info("Build complete!")
+    logger.info("=" * 60)
+    logger.info(f"Generated files:")
+    logger.info("  - index.html")
+    logger.info("  - catalog.html")
+    logger.info("  - resources_data.json")
+    logger.info("  - nav/*.json (file selector data)")
+    logger.info('')
 
 
 if __name__ == '__main__':
-    main()
+    try:
+        main()
+    finally:
+        session.close()
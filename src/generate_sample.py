@@ -4,6 +4,7 @@ Generate static HTML files using sample data
 This can be used when the GitHub API is unavailable
 """
 
+import logging
 import os
 import sys
 
@@ -285,6 +286,9 @@ SAMPLE_RESOURCES = {
 
 def main():
     """Generate HTML files with sample data"""
+    # build_site reports progress (e.g. the nav file count) through logging
+    logging.basicConfig(level=os.environ.get('LOG_LEVEL', 'INFO').upper(), format='%(message)s')
+
     print("=" * 60)
     print("Generating Static Site with Sample Data")
     print("=" * 60)
@@ -296,13 +300,13 @@ def main():
     print("2. Generating index.html...")
     index_html = generate_index_html(readme_formatted)
     output_dir = os.path.join(os.path.dirname(__file__), '..')
-    with open(os.path.join(output_dir, 'index.html'), 'w') as f:
+    with open(os.path.join(output_dir, 'index.html'), 'w', encoding='utf-8') as f:
         f.write(index_html)
     print("   ✓ Created index.html")
     
     print("3. Generating catalog.html...")
     catalog_html = generate_catalog_html(SAMPLE_RESOURCES)
-    with open(os.path.join(output_dir, 'catalog.html'), 'w') as f:
+    with open(os.path.join(output_dir, 'catalog.html'), 'w', encoding='utf-8') as f:
         f.write(catalog_html)
     print("   ✓ Created catalog.html")
 
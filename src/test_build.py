@@ -4,19 +4,37 @@ Test the build script with sample data to verify functionality
 """
 
 import json
+import logging
 import os
-import yaml
+import re
+import time
+import requests
+import build_site
 from build_site import (
     markdown_to_html,
     format_readme_sections,
     generate_index_html,
     generate_catalog_html,
+    write_catalog_html,
     get_language_name,
     get_first_json_path,
     get_json_files_with_labels,
     get_format_paths_by_book,
+    get_nested,
+    get_tree_directories,
+    group_resources_by_type,
+    compute_hash,
+    compute_output_hash,
+    get_output_hash_key,
+    is_up_to_date,
+    TokenRotationAuth,
+    get_rate_limit_wait,
+    rate_limited_get,
+    MAX_RATE_LIMIT_RETRIES,
+    get_languages,
     generate_nav_files,
     get_catalog_resources,
+    get_catalog_language_names,
     get_bible_book_name,
     is_roman_script_language,
     transform_label
@@ -248,6 +266,27 @@ def test_markdown_conversion():
     assert '<em>' in html
     assert '<a href=' in html
     assert '<code>' in html
+
+    # Inline spans may wrap onto the next line of a paragraph
+    html = markdown_to_html("line two _wrapped\nemphasis_ end and [link\ntext](u)")
+    assert '<em>wrapped emphasis</em>' in html
+    assert '<a href="u" target="_blank">link text</a>' in html
+
+    # but never cross a blank line or a header, and unclosed delimiters are left as is
+    html = markdown_to_html("a _b\n\nc_ d\n\n[x [y](z) `q")
+    assert '<em>' not in html
+    assert '<a href="z" target="_blank">y</a>' in html
+    assert '[x ' in html and '`q' in html
+    assert '<em>' not in markdown_to_html("a _b\n## Header\nc_ d")
+
+    # Underscores in code spans and link URLs are not emphasis
+    html = markdown_to_html("`a_b_c` and _see [docs](http://x.org/a_b)_")
+    assert '<code>a_b_c</code>' in html
+    assert '<em>see <a href="http://x.org/a_b" target="_blank">docs</a></em>' in html
+
+    # Bullet lists become <ul> blocks separate from the surrounding paragraphs
+    html = markdown_to_html("Includes:\n- One _a_\n* Two\nAfter")
+    assert html == '<p>Includes:</p>\n<ul>\n<li>One <em>a</em></li>\n<li>Two</li>\n</ul>\n<p>After</p>\n'
     print("✓ Markdown conversion works")
 
 
@@ -257,6 +296,14 @@ def test_readme_sections():
     html = markdown_to_html(SAMPLE_README)
     formatted = format_readme_sections(html)
     assert 'content-section' in formatted
+    # Every section is closed and keeps a well-formed heading
+    assert formatted.count('<section') == formatted.count('</section>')
+    assert formatted.count('<h2>') == formatted.count('</h2>') == SAMPLE_README.count('\n## ')
+    assert format_readme_sections('<p>Intro</p>\n<h2>A</h2>\n<p>x</p>\n') == (
+        '<section class="content-section"><p>Intro</p></section>'
+        '<section class="content-section"><h2>A</h2>\n<p>x</p></section>'
+    )
+    assert format_readme_sections('') == ''
     print("✓ README section formatting works")
 
 
@@ -285,16 +332,34 @@ def test_catalog_generation():
     assert 'Open Bible Dictionary' in catalog_html
     assert 'RESOURCES_DATA' in catalog_html
     assert 'Spanish' in catalog_html
+
+    # Titles are escaped in the markup and data cannot close the script element
+    unsafe = {'X': {'name': 'X', 'title': 'A <b> & </script>', 'resource_type': 'Test', 'languages': {}}}
+    catalog_html = generate_catalog_html(unsafe)
+    assert '>A &lt;b&gt; &amp; &lt;/script&gt;</option>' in catalog_html
+    assert '"title":"A <b> & <\\/script>"' in catalog_html
+
+    # Streaming the page to a file writes the same markup
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        test_file = os.path.join(temp_dir, 'catalog.html')
+        write_catalog_html(SAMPLE_RESOURCES, test_file)
+        with open(test_file, encoding='utf-8') as f:
+            streamed_html = f.read()
+    build_version = re.compile(r'\d{4}-\d{2}-\d{2}@\d{2}:\d{2}:\d{2}')
+    assert build_version.sub('', streamed_html) == build_version.sub('', generate_catalog_html(SAMPLE_RESOURCES))
     print("✓ catalog.html generation works")
 
 
-def test_yaml_compatibility():
-    """Test that resource data can be saved as YAML"""
-    print("Testing YAML compatibility...")
-    yaml_str = yaml.dump(SAMPLE_RESOURCES, default_flow_style=False, sort_keys=False)
-    assert 'UWTranslationNotes' in yaml_str
-    assert 'English' in yaml_str
-    print("✓ YAML export works")
+def test_json_compatibility():
+    """Test that resource data can be saved as JSON"""
+    print("Testing JSON compatibility...")
+    json_str = json.dumps(SAMPLE_RESOURCES, indent=2, ensure_ascii=False)
+    assert 'UWTranslationNotes' in json_str
+    assert 'English' in json_str
+    assert json.loads(json_str) == SAMPLE_RESOURCES
+    print("✓ JSON export works")
 
 
 def test_language_name():
@@ -315,9 +380,9 @@ def test_english_title_priority():
     assert 'English Title Here' in catalog_html
     
     # Extract the dropdown section and verify Spanish title is not there
-    dropdown_start = catalog_html.find('<select id="resource-select">')
-    dropdown_end = catalog_html.find('</select>', dropdown_start)
-    dropdown_section = catalog_html[dropdown_start:dropdown_end]
+    _, found, after_select = catalog_html.partition('<select id="resource-select">')
+    assert found
+    dropdown_section, _, _ = after_select.partition('</select>')
     
     # Verify Spanish title is NOT in the dropdown options
     assert 'Título en Español' not in dropdown_section
@@ -654,6 +719,16 @@ def test_catalog_resources_without_json_files():
     # Check that first_json_path is still present
     uw_eng = catalog_resources['UWTranslationNotes']['languages']['eng']
     assert 'first_json_path' in uw_eng, "first_json_path should still be present"
+
+    # Fields the page script never reads and empty values are left out
+    assert 'description' not in catalog_resources['UWTranslationNotes']
+    assert uw_eng['has_json'] is True and 'has_pdf' not in uw_eng
+    # Language names are embedded once for the whole page instead
+    assert 'name' not in uw_eng
+    assert get_catalog_language_names(SAMPLE_RESOURCES)['spa'] == 'Spanish'
+    assert 'const LANGUAGE_NAMES = {' in generate_catalog_html(catalog_resources)
+    assert uw_eng['citation']['license_name'] == 'CC BY-SA 4.0 license'
+    assert catalog_resources['UWTranslationNotes']['release_tag'] == 'v2025-02-10'
     
     print("✓ Catalog resources without json_files works")
 
@@ -920,6 +995,429 @@ def test_get_format_paths_by_book():
     print("✓ get_format_paths_by_book works")
 
 
+def test_get_nested():
+    """Test dotted-path lookups in nested metadata"""
+    print("Testing get_nested...")
+
+    license_meta = {'copyright': {'dates': '2022', 'holder': {'name': 'unfoldingWord'}}}
+    assert get_nested(license_meta, 'copyright.holder.name') == 'unfoldingWord'
+    assert get_nested(license_meta, 'copyright.dates') == '2022'
+    assert get_nested(license_meta, 'copyright.statement') is None
+    assert get_nested(license_meta, 'copyright.holder.name.first') is None
+    # Null levels are treated as missing
+    assert get_nested({'copyright': None}, 'copyright.holder.name') is None
+    assert get_nested({'scripture_burrito': None}, 'scripture_burrito.ingredients', {}) == {}
+    assert get_nested(None, 'copyright') is None
+
+    print("✓ get_nested works")
+
+
+def test_get_tree_directories():
+    """Test directory and language discovery from a Git tree listing"""
+    print("Testing get_tree_directories...")
+
+    tree = {
+        'sha': 'abc123',
+        'truncated': False,
+        'tree': [
+            {'path': 'README.md', 'type': 'blob'},
+            {'path': 'eng', 'type': 'tree', 'sha': 'e1'},
+            {'path': 'eng/json', 'type': 'tree'},
+            {'path': 'eng/json/01.content.json', 'type': 'blob'},
+            {'path': 'eng/json/images', 'type': 'tree'},
+            {'path': 'eng/metadata.json', 'type': 'blob'},
+            {'path': 'eng/pdf', 'type': 'tree'},
+            {'path': 'scripts', 'type': 'tree'},
+            {'path': 'spa', 'type': 'tree', 'sha': 's1'},
+            {'path': 'spa/json', 'type': 'tree'}
+        ]
+    }
+
+    directories = get_tree_directories(tree)
+    # Only directories at most two levels deep are listed, in tree order
+    assert directories == ['eng', 'eng/json', 'eng/pdf', 'scripts', 'spa', 'spa/json']
+
+    # Subtrees fetched on their own are prefixed with their parent path
+    subtree = {'tree': [{'path': 'md', 'type': 'tree'}, {'path': 'metadata.json', 'type': 'blob'}]}
+    assert get_tree_directories(subtree, prefix='fra/') == ['fra/md']
+
+    # Languages are the top-level 3-letter directories
+    assert get_languages(directories) == ['eng', 'spa']
+
+    # Missing tree yields no directories
+    assert get_tree_directories(None) == []
+    assert get_languages([]) == []
+
+    print("✓ get_tree_directories works")
+
+
+def test_incremental_build_hashes():
+    """Test the input hashes used to skip unchanged outputs"""
+    print("Testing incremental build hashes...")
+
+    resources_hash = compute_hash('generator', json.dumps(SAMPLE_RESOURCES, sort_keys=True))
+    assert resources_hash == compute_hash('generator', json.dumps(SAMPLE_RESOURCES, sort_keys=True))
+    # Changing the generator (templates) or the data changes the hash
+    assert resources_hash != compute_hash('generator v2', json.dumps(SAMPLE_RESOURCES, sort_keys=True))
+    assert compute_hash('ab', 'c') != compute_hash('a', 'bc')
+
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        catalog_path = os.path.join(temp_dir, 'catalog.html')
+        with open(catalog_path, 'w', encoding='utf-8') as f:
+            f.write('<html>real</html>')
+        generate_nav_files(SAMPLE_RESOURCES, temp_dir)
+        nav_path = os.path.join(temp_dir, 'nav')
+        outputs = [catalog_path, nav_path]
+        missing = [os.path.join(temp_dir, 'does-not-exist.html')]
+
+        previous = {'resources': resources_hash}
+        for path in outputs:
+            previous[get_output_hash_key(path)] = compute_output_hash(path)
+        assert get_output_hash_key(nav_path) == 'output:nav'
+        assert compute_output_hash(missing[0]) is None
+
+        assert is_up_to_date('resources', resources_hash, previous, outputs)
+        assert not is_up_to_date('resources', compute_hash('other'), previous, outputs)
+        assert not is_up_to_date('resources', resources_hash, previous, missing)
+        assert not is_up_to_date('resources', resources_hash, {}, outputs)
+        # Outputs without a recorded hash (e.g. from an older build) are rebuilt
+        assert not is_up_to_date('resources', resources_hash, {'resources': resources_hash}, outputs)
+
+        # An output overwritten since the build (e.g. by generate_sample.py) is rebuilt
+        with open(catalog_path, 'w', encoding='utf-8') as f:
+            f.write('<html>sample</html>')
+        assert not is_up_to_date('resources', resources_hash, previous, outputs)
+        previous[get_output_hash_key(catalog_path)] = compute_output_hash(catalog_path)
+        assert is_up_to_date('resources', resources_hash, previous, outputs)
+
+        # So is a changed or added nav file
+        with open(os.path.join(nav_path, 'Extra_eng.json'), 'w', encoding='utf-8') as f:
+            f.write('[]')
+        assert not is_up_to_date('resources', resources_hash, previous, outputs)
+
+    print("✓ Incremental build hashes work")
+
+
+def test_fetch_metadata_batch():
+    """Test parsing of the GraphQL metadata query"""
+    print("Testing GraphQL metadata batch...")
+
+    eng_metadata = {'resource_metadata': {'title': 'English Title'}}
+    graphql = {'status': 200, 'body': None}
+    queries = []
+
+    class FakeSession:
+        def post(self, url, **kwargs):
+            queries.append(kwargs['json'])
+            response = requests.Response()
+            response.status_code = graphql['status']
+            response.url = url
+            response._content = json.dumps(graphql['body']).encode('utf-8')
+            return response
+
+    original_session = build_site.session
+    original_token = build_site.GITHUB_TOKEN
+    try:
+        build_site.session = FakeSession()
+        build_site.GITHUB_TOKEN = 'test-token'
+
+        graphql['body'] = {'data': {'repository': {
+            'f0': {'text': json.dumps(eng_metadata), 'isTruncated': False},
+            'f1': None,  # no metadata.json for this language
+            'f2': {'text': '{"resource_metadata": {', 'isTruncated': True},
+            'f3': {'text': 'not json', 'isTruncated': False},
+        }}}
+        metadata = build_site.fetch_metadata_batch('TestRepo', ['eng', 'fra', 'spa', 'hin'])
+        # Truncated blobs are left out so the caller fetches them individually
+        assert metadata == {'eng': eng_metadata, 'fra': None, 'hin': None}
+        query = queries[-1]['query']
+        assert 'f0: object(expression: "main:eng/metadata.json")' in query
+        assert 'f3: object(expression: "main:hin/metadata.json")' in query
+        assert queries[-1]['variables'] == {'owner': 'BibleAquifer', 'name': 'TestRepo'}
+
+        # GraphQL errors and failed requests make the caller fall back to REST
+        graphql['body'] = {'data': {'repository': None}, 'errors': [{'message': 'Could not resolve'}]}
+        assert build_site.fetch_metadata_batch('TestRepo', ['eng']) is None
+        graphql['status'] = 502
+        graphql['body'] = {'message': 'Bad gateway'}
+        assert build_site.fetch_metadata_batch('TestRepo', ['eng']) is None
+
+        # Nothing is queried without a token or without languages
+        query_count = len(queries)
+        assert build_site.fetch_metadata_batch('TestRepo', []) is None
+        build_site.GITHUB_TOKEN = ''
+        assert build_site.fetch_metadata_batch('TestRepo', ['eng']) is None
+        assert len(queries) == query_count
+    finally:
+        build_site.session = original_session
+        build_site.GITHUB_TOKEN = original_token
+
+    print("✓ GraphQL metadata batch works")
+
+
+def test_cached_get():
+    """Test that cached_get revalidates with ETags and serves 304s from the cache"""
+    print("Testing conditional request cache...")
+    import tempfile
+
+    url = 'https://api.github.com/orgs/BibleAquifer/repos?per_page=100&page=1'
+    link = '<https://api.github.com/orgs/BibleAquifer/repos?per_page=100&page=2>; rel="next"'
+    server = {'body': b'[1]'}
+    requests_made = []
+
+    def fake_rate_limited_get(request_url, headers=None):
+        requests_made.append(headers)
+        response = requests.Response()
+        response.url = request_url
+        if headers and headers.get('If-None-Match') == '"etag-1"':
+            # Not modified; this 304 leaves out the Link header
+            response.status_code = 304
+            response._content = b''
+        else:
+            response.status_code = 200
+            response._content = server['body']
+            response.headers.update({'ETag': '"etag-1"', 'Link': link})
+        return response
+
+    original_get = build_site.rate_limited_get
+    original_cache_dir = build_site.RESPONSE_CACHE_DIR
+    original_entries = dict(build_site.etag_cache)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        try:
+            build_site.rate_limited_get = fake_rate_limited_get
+            build_site.RESPONSE_CACHE_DIR = temp_dir
+            build_site.etag_cache.clear()
+
+            # A 200 with an ETag is stored along with its body and Link header
+            response = build_site.cached_get(url)
+            assert response.status_code == 200
+            assert requests_made == [None]
+            entry = build_site.etag_cache[url]
+            assert entry['etag'] == '"etag-1"'
+            assert entry['link'] == link
+            assert os.path.exists(os.path.join(temp_dir, entry['file']))
+
+            # A 304 becomes a 200 with the cached body and the cached Link header
+            server['body'] = b'[2]'
+            response = build_site.cached_get(url)
+            assert requests_made[-1] == {'If-None-Match': '"etag-1"'}
+            assert response.status_code == 200
+            assert response.json() == [1]
+            assert response.headers['Link'] == link
+
+            # If the cached body is gone, the resource is fetched again without the ETag
+            os.remove(os.path.join(temp_dir, entry['file']))
+            response = build_site.cached_get(url)
+            assert requests_made[-2:] == [{'If-None-Match': '"etag-1"'}, None]
+            assert response.status_code == 200
+            assert response.json() == [2]
+            assert url not in build_site.etag_cache
+        finally:
+            build_site.rate_limited_get = original_get
+            build_site.RESPONSE_CACHE_DIR = original_cache_dir
+            build_site.etag_cache.clear()
+            build_site.etag_cache.update(original_entries)
+
+    print("✓ Conditional request cache works")
+
+
+def test_repo_state_reuse():
+    """Test that repositories with an unchanged tree reuse the previous build's data"""
+    print("Testing repository state reuse...")
+    import tempfile
+
+    def make_metadata(lang):
+        return {'resource_metadata': {'title': f'Title {lang}', 'resource_type': 'Bible', 'language': lang}}
+
+    tree = {'sha': 'tree-1'}
+    release = {'tag': 'v1'}
+    available = {'eng': make_metadata('eng'), 'spa': None}
+    batch_calls = []
+
+    def fake_fetch_repo_directories(repo_name):
+        return tree['sha'], ['eng', 'eng/json', 'spa']
+
+    def fake_fetch_metadata_batch(repo_name, languages):
+        batch_calls.append(list(languages))
+        return {lang: available[lang] for lang in languages}
+
+    def fake_fetch_metadata(repo_name, language):
+        raise AssertionError("the GraphQL batch returned every language")
+
+    stubs = {
+        'fetch_repo_directories': fake_fetch_repo_directories,
+        'fetch_metadata_batch': fake_fetch_metadata_batch,
+        'fetch_metadata': fake_fetch_metadata,
+        'fetch_latest_release_tag': lambda repo_name: release['tag'],
+    }
+    originals = {name: getattr(build_site, name) for name in stubs}
+    original_cache_dir = build_site.CACHE_DIR
+    original_state_file = build_site.REPO_STATE_FILE
+    repo = {'name': 'TestRepo', 'description': 'First description', 'url': 'https://example.com/TestRepo'}
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        try:
+            for name, stub in stubs.items():
+                setattr(build_site, name, stub)
+            build_site.CACHE_DIR = temp_dir
+            build_site.REPO_STATE_FILE = os.path.join(temp_dir, 'repo_state.json')
+            build_site.repo_state.clear()
+
+            # A language whose metadata failed to load is not remembered
+            resource, log = build_site.build_repository_data(repo)
+            assert set(resource['languages']) == {'eng'}
+            assert 'TestRepo' not in build_site.repo_state
+
+            # A complete result is remembered with its tree SHA
+            available['spa'] = make_metadata('spa')
+            resource, log = build_site.build_repository_data(repo)
+            assert set(resource['languages']) == {'eng', 'spa'}
+            assert build_site.repo_state['TestRepo']['tree_sha'] == 'tree-1'
+            assert len(batch_calls) == 2
+
+            # An unchanged tree reuses the data, refreshing the details and release tag
+            repo['description'] = 'Second description'
+            release['tag'] = 'v2'
+            reused, log = build_site.build_repository_data(repo)
+            assert len(batch_calls) == 2, "Unchanged repository should not fetch metadata"
+            assert (logging.INFO, "  Unchanged since the last build") in log
+            assert reused['description'] == 'Second description'
+            assert reused['release_tag'] == 'v2'
+            assert reused['languages'] == resource['languages']
+            # The stored state is not modified by the refresh
+            assert build_site.repo_state['TestRepo']['resource']['release_tag'] == 'v1'
+
+            # The state only survives a reload by the same generator
+            build_site.save_repo_state('generator-a')
+            build_site.repo_state.clear()
+            build_site.load_repo_state('generator-b')
+            assert build_site.repo_state == {}
+            build_site.load_repo_state('generator-a')
+            assert build_site.repo_state['TestRepo']['tree_sha'] == 'tree-1'
+
+            # A changed tree rebuilds the resource
+            tree['sha'] = 'tree-2'
+            build_site.build_repository_data(repo)
+            assert len(batch_calls) == 3
+            assert build_site.repo_state['TestRepo']['tree_sha'] == 'tree-2'
+        finally:
+            for name, original in originals.items():
+                setattr(build_site, name, original)
+            build_site.CACHE_DIR = original_cache_dir
+            build_site.REPO_STATE_FILE = original_state_file
+            build_site.repo_state.clear()
+
+    print("✓ Repository state reuse works")
+
+
+def test_token_rotation():
+    """Test that requests rotate through the tokens and skip rate-limited ones"""
+    print("Testing token rotation...")
+
+    auth = TokenRotationAuth(['token-a', 'token-b'])
+
+    def authorize():
+        return auth(requests.Request('GET', 'https://api.github.com/rate_limit').prepare())
+
+    assert authorize().headers['Authorization'] == 'token token-a'
+    assert authorize().headers['Authorization'] == 'token token-b'
+    request = authorize()
+    assert request.headers['Authorization'] == 'token token-a'
+
+    # A response reporting no remaining calls takes the token out of rotation
+    response = requests.Response()
+    response.status_code = 200
+    response.headers['X-RateLimit-Remaining'] = '0'
+    response.headers['X-RateLimit-Reset'] = str(int(time.time()) + 600)
+    for hook in request.hooks['response']:
+        hook(response)
+    assert authorize().headers['Authorization'] == 'token token-b'
+    assert authorize().headers['Authorization'] == 'token token-b'
+
+    # GraphQL limits do not affect the REST rotation
+    response.headers['X-RateLimit-Resource'] = 'graphql'
+    auth.record_rate_limit('token-b', response)
+    assert authorize().headers['Authorization'] == 'token token-b'
+
+    print("✓ Token rotation works")
+
+
+def test_rate_limit_wait():
+    """Test how long rate-limited responses wait before a retry"""
+    print("Testing rate limit waits...")
+
+    def make_response(status_code, body='', **headers):
+        response = requests.Response()
+        response.status_code = status_code
+        response._content = body.encode('utf-8')
+        response.headers.update(headers)
+        return response
+
+    assert get_rate_limit_wait(make_response(200), 0) is None
+    assert get_rate_limit_wait(make_response(404), 0) is None
+    # Retry-After is honored exactly
+    assert get_rate_limit_wait(make_response(429, **{'Retry-After': '3'}), 0) == 3
+    assert get_rate_limit_wait(make_response(403, **{'Retry-After': '20'}), 2) == 20
+    # Secondary rate limits back off exponentially
+    secondary = make_response(403, '{"message": "You have exceeded a secondary rate limit."}')
+    assert 60 <= get_rate_limit_wait(secondary, 0) < 120
+    assert 120 <= get_rate_limit_wait(secondary, 1) < 240
+    # Other 403s (e.g. missing permissions) are not retried
+    assert get_rate_limit_wait(make_response(403, '{"message": "Resource not accessible"}'), 0) is None
+
+    print("✓ Rate limit waits work")
+
+
+def test_rate_limited_get_retries_429():
+    """Test that a 429 reaches rate_limited_get instead of being retried by urllib3"""
+    print("Testing rate-limited GET on 429 responses...")
+    import threading
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+
+    hits = []
+
+    class RateLimitedHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            hits.append(self.path)
+            # Rate limited on the first request only
+            if len(hits) == 1 or self.path == '/always-limited':
+                self.send_response(429)
+                self.send_header('Retry-After', '0')
+                body = b'{"message": "rate limited"}'
+            else:
+                self.send_response(200)
+                body = b'{"ok": true}'
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(('127.0.0.1', 0), RateLimitedHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f'http://127.0.0.1:{server.server_port}'
+    try:
+        response = rate_limited_get(f'{base_url}/limited-once')
+        assert response.status_code == 200
+        assert response.json() == {'ok': True}
+        assert len(hits) == 2, f"Expected one retry, got {len(hits)} requests"
+
+        # A persistent 429 is returned after the rate limit retries, not raised as a RetryError
+        hits.clear()
+        response = rate_limited_get(f'{base_url}/always-limited')
+        assert response.status_code == 429
+        assert len(hits) == MAX_RATE_LIMIT_RETRIES + 1
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    print("✓ Rate-limited GET on 429 responses works")
+
+
 def test_bible_download_bar_in_catalog():
     """Test that the download bar JS supports Bible resources via nav data formats"""
     print("Testing Bible download bar in catalog...")
@@ -980,6 +1478,17 @@ def test_resource_type_grouping_in_catalog():
     assert 'value="IndianRevisedVersion"' in catalog_html
     assert 'value="AquiferOpenBibleDictionary"' in catalog_html
 
+    # Groups are sorted by type and resources within a group by title, ignoring case
+    groups = group_resources_by_type({
+        'b': {'name': 'b', 'title': 'beta', 'resource_type': 'Dictionary'},
+        'a': {'name': 'a', 'title': 'Alpha', 'resource_type': 'Dictionary'},
+        'c': {'name': 'c', 'title': 'Gamma', 'resource_type': 'Bible'}
+    })
+    assert [(name, [r['name'] for r in group]) for name, group in groups] == [
+        ('Bible', ['c']),
+        ('Dictionary', ['a', 'b'])
+    ]
+
     print("\u2713 Resource type grouping works")
 
 
@@ -1000,84 +1509,30 @@ def test_release_tag_in_catalog():
     print("\u2713 release_tag in catalog works")
 
 
-def main():
-    """Run all tests"""
-    print("=" * 60)
-    print("Running Build Script Tests")
-    print("=" * 60)
-    print()
+def write_sample_files():
+    """Write sample output files for inspection"""
+    print("\nGenerating sample output files...")
     
-    try:
-        test_markdown_conversion()
-        test_readme_sections()
-        test_index_generation()
-        test_catalog_generation()
-        test_yaml_compatibility()
-        test_language_name()
-        test_english_title_priority()
-        test_adaptation_notice_display()
-        test_get_first_json_path()
-        test_preview_tab_in_catalog()
-        test_preview_navigation_in_catalog()
-        test_rtl_language_support()
-        test_default_language_selection()
-        test_get_json_files_with_labels()
-        test_file_selector_in_catalog()
-        test_file_selector_auto_switch_to_preview()
-        test_nav_files_generation()
-        test_catalog_resources_without_json_files()
-        test_get_bible_book_name()
-        test_is_roman_script_language()
-        test_transform_label()
-        test_get_json_files_with_labels_canonical()
-        test_get_json_files_with_labels_alphabetical()
-        test_get_json_files_with_labels_monograph()
-        test_get_format_paths_by_book()
-        test_bible_download_bar_in_catalog()
-        test_copyright_statement_display()
-        test_relative_image_url_resolution()
-        test_resource_type_grouping_in_catalog()
-        test_release_tag_in_catalog()
-
-        print()
-        print("=" * 60)
-        print("All tests passed! ✓")
-        print("=" * 60)
-        
-        # Generate sample output files for inspection
-        print("\nGenerating sample output files...")
-        
-        html = markdown_to_html(SAMPLE_README)
-        formatted = format_readme_sections(html)
-        index_html = generate_index_html(formatted)
-        
-        output_dir = os.path.dirname(__file__)
-        with open(os.path.join(output_dir, 'test_index.html'), 'w') as f:
-            f.write(index_html)
-        print("  Created: test_index.html")
-        
-        catalog_html = generate_catalog_html(SAMPLE_RESOURCES)
-        with open(os.path.join(output_dir, 'test_catalog.html'), 'w') as f:
-            f.write(catalog_html)
-        print("  Created: test_catalog.html")
-        
-        with open(os.path.join(output_dir, 'test_resources.yaml'), 'w') as f:
-            yaml.dump(SAMPLE_RESOURCES, f, default_flow_style=False, sort_keys=False)
-        print("  Created: test_resources.yaml")
-        
-        print("\nYou can inspect these test files to verify the output format.")
-        
-    except AssertionError as e:
-        print(f"\n❌ Test failed: {e}")
-        return 1
-    except Exception as e:
-        print(f"\n❌ Unexpected error: {e}")
-        import traceback
-        traceback.print_exc()
-        return 1
+    html = markdown_to_html(SAMPLE_README)
+    formatted = format_readme_sections(html)
+    index_html = generate_index_html(formatted)
+    
+    output_dir = os.path.dirname(__file__)
+    with open(os.path.join(output_dir, 'test_index.html'), 'w', encoding='utf-8') as f:
+        f.write(index_html)
+    print("  Created: test_index.html")
+    
+    catalog_html = generate_catalog_html(SAMPLE_RESOURCES)
+    with open(os.path.join(output_dir, 'test_catalog.html'), 'w', encoding='utf-8') as f:
+        f.write(catalog_html)
+    print("  Created: test_catalog.html")
+    
+    with open(os.path.join(output_dir, 'test_resources.json'), 'w', encoding='utf-8') as f:
+        json.dump(SAMPLE_RESOURCES, f, indent=2, ensure_ascii=False)
+    print("  Created: test_resources.json")
     
-    return 0
+    print("\nYou can inspect these test files to verify the output format.")
 
 
 if __name__ == '__main__':
-    exit(main())
+    write_sample_files()